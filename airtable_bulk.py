@@ -0,0 +1,239 @@
+"""
+Airtable Bulk Writer
+Chunked, rate-paced, pipelined batch writes for AirtableClient.
+
+Airtable accepts at most 10 records per write request and about 5 requests
+per second per base. BulkWriter splits any number of records into 10-record
+chunks, keeps several requests in flight, retries 429s with backoff and
+reports the outcome of every record. Pacing comes from the client's
+GuardedApi, whose per-base token bucket every request (reads included) draws
+from, so the writer runs at the highest rate the base budget allows.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+from pyairtable.api.table import Table
+
+from rate_limit import compute_backoff, parse_retry_after
+
+MAX_RECORDS_PER_REQUEST = 10
+
+# Statuses Airtable uses for requests rejected as invalid (nothing written)
+INVALID_REQUEST_STATUSES = (400, 422)
+
+# Sends one chunk and returns the written records in request order
+ChunkSender = Callable[[Table, List[Dict]], List[Dict]]
+
+
+@dataclass
+class RecordResult:
+    """Outcome of writing one input record."""
+    index: int
+    record: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkWriteReport:
+    """Per-record results of a bulk write, in input order."""
+    results: List[RecordResult] = field(default_factory=list)
+    # Upserts only: IDs Airtable reports as newly created / updated
+    created_ids: List[str] = field(default_factory=list)
+    updated_ids: List[str] = field(default_factory=list)
+    requests: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[RecordResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[RecordResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def records(self) -> List[Dict]:
+        """Records returned by Airtable for every successful write."""
+        return [result.record for result in self.results if result.ok]
+
+    def raise_for_failures(self) -> None:
+        """Raise BulkWriteError if any record failed."""
+        if self.failed:
+            raise BulkWriteError(self)
+
+
+class BulkWriteError(Exception):
+    """Raised when some records of a bulk write failed; carries the full report."""
+
+    def __init__(self, report: BulkWriteReport):
+        self.report = report
+        first = report.failed[0]
+        super().__init__(
+            f"{len(report.failed)} of {len(report.results)} record(s) failed "
+            f"(first: #{first.index}: {first.error})"
+        )
+
+
+def _status(error: requests.HTTPError) -> Optional[int]:
+    return error.response.status_code if error.response is not None else None
+
+
+class BulkWriter:
+    """Pipelined writer for Airtable batch operations."""
+
+    def __init__(
+        self,
+        max_in_flight: int = 5,
+        max_retries: int = 5,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 30.0,
+        isolate_failures: bool = True,
+    ):
+        """
+        Args:
+            max_in_flight: Concurrent requests.
+            max_retries: Retries per chunk after a 429.
+            isolate_failures: When a chunk is rejected as invalid, resend
+                its records one at a time so only the bad records fail.
+        """
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.isolate_failures = isolate_failures
+
+    def create(self, table: Table, records: Iterable[Dict], typecast: bool = False) -> BulkWriteReport:
+        """Create records (each a dict of fields)."""
+        return self.write(table, records, lambda t, chunk: t.batch_create(chunk, typecast=typecast))
+
+    def update(self, table: Table, records: Iterable[Dict], replace: bool = False,
+               typecast: bool = False) -> BulkWriteReport:
+        """Update records (each ``{"id": ..., "fields": {...}}``)."""
+        return self.write(
+            table, records, lambda t, chunk: t.batch_update(chunk, replace=replace, typecast=typecast)
+        )
+
+    def upsert(self, table: Table, records: Iterable[Dict], key_fields: List[str],
+               replace: bool = False, typecast: bool = False) -> BulkWriteReport:
+        """
+        Create or update records matched on ``key_fields`` (Airtable's
+        performUpsert). Records are ``{"fields": {...}}`` dicts; plain field
+        dicts are wrapped automatically.
+        """
+        if not key_fields:
+            raise ValueError("key_fields must name at least one field to match records on")
+
+        created: List[str] = []
+        updated: List[str] = []
+        lock = threading.Lock()
+
+        def send(t: Table, chunk: List[Dict]) -> List[Dict]:
+            response = t.batch_upsert(chunk, key_fields=key_fields, replace=replace, typecast=typecast)
+            with lock:
+                created.extend(response.get("createdRecords", []))
+                updated.extend(response.get("updatedRecords", []))
+            return response["records"]
+
+        normalized = (record if "fields" in record else {"fields": record} for record in records)
+        report = self.write(table, normalized, send)
+        report.created_ids = created
+        report.updated_ids = updated
+        return report
+
+    def write(self, table: Table, records: Iterable[Dict], send: ChunkSender) -> BulkWriteReport:
+        """
+        Write ``records`` in chunks using ``send``. Chunks are submitted
+        lazily, so at most a few chunks' worth of input is held in flight.
+        """
+        report = BulkWriteReport()
+        results: Dict[int, RecordResult] = {}
+        lock = threading.Lock()
+        started = time.monotonic()
+
+        def run(offset: int, chunk: List[Dict]) -> None:
+            for result in self._write_chunk(table, send, offset, chunk, report, lock):
+                results[result.index] = result
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            pending = set()
+            for offset, chunk in self._chunks(records):
+                if len(pending) >= self.max_in_flight * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(pool.submit(run, offset, chunk))
+            for future in pending:
+                future.result()
+
+        report.results = [results[index] for index in sorted(results)]
+        report.elapsed = time.monotonic() - started
+        return report
+
+    @staticmethod
+    def _chunks(records: Iterable[Dict]) -> Iterable[Tuple[int, List[Dict]]]:
+        chunk: List[Dict] = []
+        offset = 0
+        for index, record in enumerate(records):
+            if not chunk:
+                offset = index
+            chunk.append(record)
+            if len(chunk) == MAX_RECORDS_PER_REQUEST:
+                yield offset, chunk
+                chunk = []
+        if chunk:
+            yield offset, chunk
+
+    def _send(self, table: Table, send: ChunkSender, chunk: Sequence[Dict],
+              report: BulkWriteReport, lock: threading.Lock) -> List[Dict]:
+        """Send one request, retrying 429s."""
+        attempt = 0
+        while True:
+            with lock:
+                report.requests += 1
+            try:
+                return send(table, list(chunk))
+            except requests.HTTPError as e:
+                if _status(e) != 429 or attempt >= self.max_retries:
+                    raise
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+            except requests.exceptions.RetryError:
+                # pyairtable's own session retries 429s and gives up with a
+                # RetryError; back off further at the chunk level
+                if attempt >= self.max_retries:
+                    raise
+                retry_after = None
+
+            time.sleep(compute_backoff(attempt, self.backoff_factor, self.max_backoff, retry_after))
+            attempt += 1
+            with lock:
+                report.retries += 1
+
+    def _write_chunk(self, table: Table, send: ChunkSender, offset: int, chunk: List[Dict],
+                     report: BulkWriteReport, lock: threading.Lock) -> List[RecordResult]:
+        try:
+            written = self._send(table, send, chunk, report, lock)
+        except requests.HTTPError as e:
+            status = _status(e)
+            # Airtable validates the whole request before writing anything, so
+            # a validation error means none of the chunk was written and single
+            # records can safely be resent to find the bad ones
+            if self.isolate_failures and len(chunk) > 1 and status in INVALID_REQUEST_STATUSES:
+                results = []
+                for i, record in enumerate(chunk):
+                    results.extend(self._write_chunk(table, send, offset + i, [record], report, lock))
+                return results
+            return [RecordResult(offset + i, error=str(e)) for i in range(len(chunk))]
+        except Exception as e:
+            return [RecordResult(offset + i, error=str(e)) for i in range(len(chunk))]
+
+        return [RecordResult(offset + i, record=record) for i, record in enumerate(written)]
@@ -4,86 +4,337 @@ Handles all interactions with the Airtable API.
 """
 
 import os
-from typing import Dict, List, Optional
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
 from pyairtable import Api
-from dotenv import load_dotenv
+from pyairtable.api.base import Base
+from pyairtable.api.table import Table
+from pyairtable.models.schema import BaseSchema, FieldSchema, TableSchema
+
+from airtable_bulk import BulkWriteReport, BulkWriter
+from config import load_env
+from rate_limit import get_breaker, get_bucket
+
+if TYPE_CHECKING:
+    from airtable_mirror import AirtableMirror
+    from airtable_query import Query, QueryCache
+
+load_env()
+
+# Airtable allows about 5 requests per second per base
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+_BASE_ID_PATTERN = re.compile(r"/(app[A-Za-z0-9]+)(?:/|$)")
+
+
+class GuardedApi(Api):
+    """
+    pyairtable Api that paces every request through a per-base token bucket
+    and fails fast through a per-base circuit breaker. Buckets and breakers
+    are shared with every other client talking to the same base.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        rate_limit_dir: Optional[str] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        **kwargs: Any,
+    ):
+        super().__init__(api_key, **kwargs)
+        self.requests_per_second = requests_per_second
+        self.rate_limit_dir = rate_limit_dir
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        # pyairtable re-enters request() when it turns a long GET into a POST;
+        # only the outermost call is paced
+        self._local = threading.local()
 
-load_dotenv()
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        if getattr(self._local, "active", False):
+            return super().request(method, url, *args, **kwargs)
+
+        match = _BASE_ID_PATTERN.search(url)
+        key = f"airtable:{match.group(1) if match else 'api'}"
+        breaker = get_breaker(key, self.failure_threshold, self.recovery_timeout)
+        breaker.before_call()
+        get_bucket(key, self.requests_per_second, shared_dir=self.rate_limit_dir).acquire()
+
+        self._local.active = True
+        try:
+            result = super().request(method, url, *args, **kwargs)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 500
+            if status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        finally:
+            self._local.active = False
+        breaker.record_success()
+        return result
 
 
 class AirtableClient:
     """Client for interacting with Airtable API."""
-    
-    def __init__(self):
-        self.api_token = os.getenv("AIRTABLE_API_TOKEN")
-        self.base_id = os.getenv("AIRTABLE_BASE_ID")
-        
+
+    def __init__(
+        self,
+        schema_ttl: Optional[float] = None,
+        bulk_writer: Optional[BulkWriter] = None,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        rate_limit_dir: Optional[str] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        api_token: Optional[str] = None,
+        base_id: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+    ):
+        """
+        Args:
+            schema_ttl: Seconds a fetched base schema stays cached. None caches
+                it until invalidate_cache() is called.
+            bulk_writer: Writer used for batch operations.
+            requests_per_second: Request budget per base, shared by every
+                client in the process (and across processes when
+                ``rate_limit_dir`` or RATE_LIMIT_DIR is set).
+            failure_threshold / recovery_timeout: After this many consecutive
+                failures calls to a base fail fast with CircuitOpenError for
+                ``recovery_timeout`` seconds.
+            api_token / base_id: Override AIRTABLE_API_TOKEN / AIRTABLE_BASE_ID.
+            endpoint_url: API root other than https://api.airtable.com (e.g.
+                a local fake for benchmarks).
+        """
+        self.api_token = api_token or os.getenv("AIRTABLE_API_TOKEN")
+        self.base_id = base_id or os.getenv("AIRTABLE_BASE_ID")
+
         if not self.api_token:
             raise ValueError("AIRTABLE_API_TOKEN must be set in .env file")
-        
-        self.api = Api(self.api_token)
+
+        self.api = GuardedApi(
+            self.api_token,
+            requests_per_second=requests_per_second,
+            rate_limit_dir=rate_limit_dir,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            **({"endpoint_url": endpoint_url} if endpoint_url else {}),
+        )
         self.base = None
-        
+        self.schema_ttl = schema_ttl
+        self.bulk_writer = bulk_writer or BulkWriter()
+
+        # Per-base caches; they survive set_base() so switching back and forth
+        # between bases doesn't rebuild handles or refetch schemas
+        self._bases: Dict[str, Base] = {}
+        self._tables: Dict[Tuple[str, str], Table] = {}
+        self._schemas: Dict[str, Tuple[float, BaseSchema]] = {}
+        self._lock = threading.Lock()
+
         if self.base_id:
-            self.base = self.api.base(self.base_id)
-    
+            self.base = self._get_base(self.base_id)
+
+    def _get_base(self, base_id: str) -> Base:
+        """Return the cached Base handle for ``base_id``."""
+        with self._lock:
+            base = self._bases.get(base_id)
+            if base is None:
+                base = self._bases[base_id] = self.api.base(base_id)
+            return base
+
     def set_base(self, base_id: str):
         """Set the active Airtable base."""
         self.base_id = base_id
-        self.base = self.api.base(base_id)
-    
-    def get_records(self, table_name: str, **kwargs) -> List[Dict]:
-        """Get all records from a table."""
+        self.base = self._get_base(base_id)
+
+    def _table(self, table_name: str) -> Table:
+        """Return the cached Table handle for ``table_name`` in the active base."""
         if not self.base:
             raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.all(**kwargs)
-    
-    def get_record(self, table_name: str, record_id: str) -> Dict:
-        """Get a specific record by ID."""
+
+        key = (self.base_id, table_name)
+        table = self._tables.get(key)
+        if table is None:
+            with self._lock:
+                table = self._tables.setdefault(key, self.base.table(table_name))
+        return table
+
+    def get_schema(self, force: bool = False) -> BaseSchema:
+        """Get the schema of every table in the active base (cached per base)."""
         if not self.base:
             raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.get(record_id)
-    
+
+        cached = self._schemas.get(self.base_id)
+        if cached and not force:
+            fetched_at, schema = cached
+            if self.schema_ttl is None or time.monotonic() - fetched_at < self.schema_ttl:
+                return schema
+
+        schema = self.base.schema(force=True)
+        self._schemas[self.base_id] = (time.monotonic(), schema)
+        return schema
+
+    def get_table_schema(self, table_name: str) -> TableSchema:
+        """Get a table's schema (by name or ID) from the cached base schema."""
+        return self.get_schema().table(table_name)
+
+    def get_fields(self, table_name: str) -> List[FieldSchema]:
+        """Get the field metadata of a table from the cached base schema."""
+        return self.get_table_schema(table_name).fields
+
+    def invalidate_cache(self, base_id: Optional[str] = None, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached table handles and schemas.
+
+        With no arguments everything is dropped; ``base_id`` limits it to one
+        base and ``table_name`` further to one table handle (plus that base's
+        schema, since table metadata lives in it).
+        """
+        with self._lock:
+            if base_id is None and table_name is None:
+                self._tables.clear()
+                self._schemas.clear()
+                return
+
+            base_id = base_id or self.base_id
+            self._schemas.pop(base_id, None)
+            for key in list(self._tables):
+                if key[0] == base_id and (table_name is None or key[1] == table_name):
+                    del self._tables[key]
+
+    def mirror(self, path: Optional[str] = None, **kwargs: Any) -> "AirtableMirror":
+        """
+        Open an incremental SQLite mirror of tables in this client's active
+        base. Call ``sync(table)`` to refresh it and read through its
+        ``get_records()`` / ``get_record()`` instead of the API.
+        """
+        from airtable_mirror import DEFAULT_MIRROR_PATH, AirtableMirror
+
+        return AirtableMirror(self, path or DEFAULT_MIRROR_PATH, **kwargs)
+
+    def query(self, table_name: str, cache: Optional["QueryCache"] = None) -> "Query":
+        """
+        Start a query on a table in the active base; filters, projection,
+        sorting and limits compile to API parameters (see airtable_query).
+        """
+        from airtable_query import Query
+
+        return Query(self, table_name, cache=cache)
+
+    def get_records(self, table_name: str, **kwargs) -> List[Dict]:
+        """Get all records from a table."""
+        return self._table(table_name).all(**kwargs)
+
+    def iter_pages(
+        self,
+        table_name: str,
+        fields: Optional[List[str]] = None,
+        formula: Optional[str] = None,
+        view: Optional[str] = None,
+        sort: Optional[List[str]] = None,
+        page_size: int = 100,
+        max_records: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Iterator[List[Dict]]:
+        """
+        Yield records a page at a time as each page arrives.
+
+        ``fields``, ``formula`` (filterByFormula), ``view``, ``sort`` (field
+        names, prefix with ``-`` for descending), ``page_size`` (max 100) and
+        ``max_records`` are all applied server-side.
+        """
+        options = dict(kwargs, page_size=page_size)
+        if fields is not None:
+            options["fields"] = fields
+        if formula:
+            options["formula"] = formula
+        if view:
+            options["view"] = view
+        if sort:
+            options["sort"] = sort
+        if max_records is not None:
+            options["max_records"] = max_records
+        return self._table(table_name).iterate(**options)
+
+    def iter_records(self, table_name: str, **options: Any) -> Iterator[Dict]:
+        """Yield records one by one, fetching pages lazily (same options as iter_pages)."""
+        for page in self.iter_pages(table_name, **options):
+            yield from page
+
+    def get_record(self, table_name: str, record_id: str) -> Dict:
+        """Get a specific record by ID."""
+        return self._table(table_name).get(record_id)
+
     def create_record(self, table_name: str, fields: Dict) -> Dict:
         """Create a new record in a table."""
-        if not self.base:
-            raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.create(fields)
-    
+        return self._table(table_name).create(fields)
+
     def update_record(self, table_name: str, record_id: str, fields: Dict) -> Dict:
         """Update an existing record."""
-        if not self.base:
-            raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.update(record_id, fields)
-    
+        return self._table(table_name).update(record_id, fields)
+
     def delete_record(self, table_name: str, record_id: str) -> Dict:
         """Delete a record."""
-        if not self.base:
-            raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.delete(record_id)
-    
+        return self._table(table_name).delete(record_id)
+
     def batch_create(self, table_name: str, records: List[Dict]) -> List[Dict]:
-        """Create multiple records at once."""
-        if not self.base:
-            raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.batch_create(records)
-    
+        """
+        Create multiple records at once.
+
+        Raises BulkWriteError (with the per-record report) if any record failed.
+        """
+        report = self.bulk_create(table_name, records)
+        report.raise_for_failures()
+        return report.records
+
     def batch_update(self, table_name: str, records: List[Dict]) -> List[Dict]:
-        """Update multiple records at once."""
-        if not self.base:
-            raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
-        
-        table = self.base.table(table_name)
-        return table.batch_update(records)
+        """
+        Update multiple records at once.
+
+        Raises BulkWriteError (with the per-record report) if any record failed.
+        """
+        report = self.bulk_update(table_name, records)
+        report.raise_for_failures()
+        return report.records
+
+    def batch_upsert(self, table_name: str, records: List[Dict], key_fields: List[str],
+                     replace: bool = False, typecast: bool = False) -> Dict:
+        """
+        Create or update records in one pass, matching existing rows on
+        ``key_fields`` server-side instead of reading the table first.
+
+        Returns ``{"records": [...], "createdRecords": [ids], "updatedRecords": [ids]}``.
+        Raises BulkWriteError (with the per-record report) if any record failed.
+        """
+        report = self.bulk_upsert(table_name, records, key_fields, replace=replace, typecast=typecast)
+        report.raise_for_failures()
+        return {
+            "records": report.records,
+            "createdRecords": report.created_ids,
+            "updatedRecords": report.updated_ids,
+        }
+
+    def bulk_create(self, table_name: str, records: Iterable[Dict], typecast: bool = False) -> BulkWriteReport:
+        """Create any number of records, chunked and rate-paced, reporting each record's outcome."""
+        return self.bulk_writer.create(self._table(table_name), records, typecast=typecast)
+
+    def bulk_update(self, table_name: str, records: Iterable[Dict], replace: bool = False,
+                    typecast: bool = False) -> BulkWriteReport:
+        """Update any number of records, chunked and rate-paced, reporting each record's outcome."""
+        return self.bulk_writer.update(self._table(table_name), records, replace=replace, typecast=typecast)
+
+    def bulk_upsert(self, table_name: str, records: Iterable[Dict], key_fields: List[str],
+                    replace: bool = False, typecast: bool = False) -> BulkWriteReport:
+        """Upsert any number of records, chunked and rate-paced, reporting each record's outcome."""
+        return self.bulk_writer.upsert(
+            self._table(table_name), records, key_fields, replace=replace, typecast=typecast
+        )
@@ -0,0 +1,234 @@
+"""
+Airtable Mirror
+Incremental local SQLite copy of Airtable tables for read-heavy jobs.
+
+Each sync pulls only records whose LAST_MODIFIED_TIME() is after the stored
+high-water mark. Deletions don't show up in that query, so the mirror
+periodically reconciles record IDs (fetching only the primary field) and
+drops rows that no longer exist. Reads are then served from disk.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_MIRROR_PATH = "airtable_mirror.db"
+
+# Overlap applied to the high-water mark to tolerate clock skew between us
+# and Airtable; re-fetching a few records is harmless since writes are upserts
+HIGH_WATER_MARK_OVERLAP = timedelta(minutes=1)
+
+# Rows read from SQLite per batch while iterating
+FETCH_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    base_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    created_time TEXT,
+    fields TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (base_id, table_name, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    base_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    high_water_mark TEXT,
+    last_reconciled REAL,
+    PRIMARY KEY (base_id, table_name)
+);
+"""
+
+
+def _format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class AirtableMirror:
+    """SQLite mirror of tables in the client's active base."""
+
+    def __init__(self, client, path: str = DEFAULT_MIRROR_PATH, reconcile_interval: float = 3600.0):
+        """
+        Args:
+            client: AirtableClient used to pull records.
+            path: SQLite database file.
+            reconcile_interval: Seconds between ID reconciliations (deletion
+                detection) performed automatically by sync().
+        """
+        self.client = client
+        self.path = path
+        self.reconcile_interval = reconcile_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def base_id(self) -> str:
+        if not self.client.base_id:
+            raise ValueError("Base ID not set. Call set_base() first or set AIRTABLE_BASE_ID in .env")
+        return self.client.base_id
+
+    def _state(self, table_name: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT high_water_mark, last_reconciled FROM sync_state WHERE base_id = ? AND table_name = ?",
+                (self.base_id, table_name),
+            ).fetchone()
+
+    def sync(self, table_name: str, full: bool = False) -> Dict[str, int]:
+        """
+        Pull records changed since the last sync (everything on the first run
+        or with ``full=True``) and reconcile deletions when due.
+
+        Returns counts of ``fetched`` and ``deleted`` records.
+        """
+        base_id = self.base_id
+        state = self._state(table_name)
+        high_water_mark = None if full or state is None else state["high_water_mark"]
+        started = datetime.now(timezone.utc) - HIGH_WATER_MARK_OVERLAP
+
+        formula = None
+        if high_water_mark:
+            formula = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{high_water_mark}'))"
+
+        fetched = 0
+        for page in self.client.iter_pages(table_name, formula=formula):
+            now = time.time()
+            rows = [
+                (base_id, table_name, record["id"], record.get("createdTime"), json.dumps(record["fields"]), now)
+                for record in page
+            ]
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records (base_id, table_name, id, created_time, fields, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            fetched += len(rows)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (base_id, table_name, high_water_mark) VALUES (?, ?, ?) "
+                "ON CONFLICT (base_id, table_name) DO UPDATE SET high_water_mark = excluded.high_water_mark",
+                (base_id, table_name, _format_timestamp(started)),
+            )
+
+        deleted = 0
+        last_reconciled = state["last_reconciled"] if state is not None else None
+        # Deleted records never match the incremental query, so local rows
+        # for them are only dropped by reconciliation
+        if full or last_reconciled is None or time.time() - last_reconciled >= self.reconcile_interval:
+            deleted = self.reconcile(table_name)
+
+        return {"fetched": fetched, "deleted": deleted}
+
+    def reconcile(self, table_name: str) -> int:
+        """
+        Delete local rows whose records no longer exist upstream. Only record
+        IDs (plus the primary field, the cheapest projection) are fetched.
+        """
+        base_id = self.base_id
+        primary_field_id = self.client.get_table_schema(table_name).primary_field_id
+        live_ids = set()
+        for page in self.client.iter_pages(table_name, fields=[primary_field_id]):
+            live_ids.update(record["id"] for record in page)
+
+        with self._lock, self._conn:
+            local_ids = [
+                row["id"]
+                for row in self._conn.execute(
+                    "SELECT id FROM records WHERE base_id = ? AND table_name = ?", (base_id, table_name)
+                )
+            ]
+            stale = [(base_id, table_name, record_id) for record_id in local_ids if record_id not in live_ids]
+            self._conn.executemany(
+                "DELETE FROM records WHERE base_id = ? AND table_name = ? AND id = ?", stale
+            )
+            self._conn.execute(
+                "INSERT INTO sync_state (base_id, table_name, last_reconciled) VALUES (?, ?, ?) "
+                "ON CONFLICT (base_id, table_name) DO UPDATE SET last_reconciled = excluded.last_reconciled",
+                (base_id, table_name, time.time()),
+            )
+        return len(stale)
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> Dict:
+        return {"id": row["id"], "createdTime": row["created_time"], "fields": json.loads(row["fields"])}
+
+    def get_record(self, table_name: str, record_id: str) -> Optional[Dict]:
+        """Get a mirrored record by ID, in the same shape the API returns."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, created_time, fields FROM records WHERE base_id = ? AND table_name = ? AND id = ?",
+                (self.base_id, table_name, record_id),
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def iter_records(
+        self,
+        table_name: str,
+        where: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Iterate mirrored records.
+
+        ``where`` maps field names to required values (equality);
+        ``order_by`` is a field name, prefixed with ``-`` for descending.
+        """
+        sql = "SELECT id, created_time, fields FROM records WHERE base_id = ? AND table_name = ?"
+        params: List[Any] = [self.base_id, table_name]
+        for field_name, value in (where or {}).items():
+            sql += " AND json_extract(fields, ?) = ?"
+            params.extend([self._json_path(field_name), value])
+        if order_by:
+            descending = order_by.startswith("-")
+            sql += f" ORDER BY json_extract(fields, ?) {'DESC' if descending else 'ASC'}"
+            params.append(self._json_path(order_by.lstrip("-")))
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_record(row)
+
+    def get_records(self, table_name: str, **query: Any) -> List[Dict]:
+        """Get mirrored records as a list (same options as iter_records)."""
+        return list(self.iter_records(table_name, **query))
+
+    def count(self, table_name: str) -> int:
+        """Number of mirrored records in a table."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM records WHERE base_id = ? AND table_name = ?",
+                (self.base_id, table_name),
+            ).fetchone()[0]
+
+    @staticmethod
+    def _json_path(field_name: str) -> str:
+        return '$."' + field_name.replace('"', '\\"') + '"'
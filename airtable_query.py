@@ -0,0 +1,390 @@
+"""
+Airtable Query
+Composable, typed queries compiled to Airtable's filterByFormula.
+
+Conditions are built from ``Field`` comparisons and combined with ``&``,
+``|`` and ``~``::
+
+    from airtable_query import Field
+
+    published = Field("Published") == True
+    recent = Field("Created").between(datetime(2026, 1, 1), datetime(2026, 2, 1))
+
+    records = (
+        airtable.query("Topics")
+        .where(published & recent, Category="Tech")
+        .fields("Topic", "Poem")
+        .sort("-Created")
+        .limit(50)
+        .all()
+    )
+
+Filtering, projection, sorting and the record limit all run server-side, so
+only matching records and requested fields are transferred. Conditions are
+immutable and hashable, and compiled formulas are memoized. Results can be
+kept in a ``QueryCache`` with a TTL, so repeated identical reads don't go
+back to Airtable.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Compiled formulas kept by compile_formula()
+FORMULA_CACHE_SIZE = 1024
+
+# Airtable returns at most this many records per page
+MAX_PAGE_SIZE = 100
+
+
+def escape_string(value: str) -> str:
+    """Quote a string literal for a formula."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def field_reference(name: str) -> str:
+    if "{" in name or "}" in name:
+        raise ValueError(f"Field name '{name}' can't be used in a formula (contains a brace)")
+    return "{" + name + "}"
+
+
+def format_value(value: Any) -> str:
+    """Render a Python value as a formula literal."""
+    if value is None:
+        return "BLANK()"
+    if isinstance(value, bool):
+        return "TRUE()" if value else "FALSE()"
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError(f"Unsupported value in formula: {value!r} (not a finite number)")
+        return repr(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return f"DATETIME_PARSE('{value.strftime('%Y-%m-%dT%H:%M:%S.000Z')}')"
+    if isinstance(value, date):
+        return f"DATETIME_PARSE('{value.isoformat()}')"
+    if isinstance(value, str):
+        return escape_string(value)
+    raise ValueError(f"Unsupported value in formula: {value!r}")
+
+
+def _is_date(value: Any) -> bool:
+    return isinstance(value, (date, datetime))
+
+
+class Condition:
+    """Base of every filter expression; combine with ``&``, ``|`` and ``~``."""
+
+    def compile(self) -> str:
+        raise NotImplementedError
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return And((self, other))
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return Or((self, other))
+
+    def __invert__(self) -> "Condition":
+        return Not(self)
+
+
+@dataclass(frozen=True, eq=False)
+class Compare(Condition):
+    field: str
+    operator: str  # one of = != < <= > >=
+    value: Any
+
+    def __post_init__(self):
+        # Fail here rather than in compile_formula(), whose cache needs hashable values
+        format_value(self.value)
+
+    # The value's type is part of equality: True == 1 and 1 == 1.0 in Python,
+    # but they compile to different formulas and share compile_formula()'s cache
+    def _key(self) -> Tuple:
+        return (self.field, self.operator, type(self.value), self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Compare):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def compile(self) -> str:
+        reference = field_reference(self.field)
+        if _is_date(self.value):
+            # Airtable compares dates reliably only through its date functions
+            value = format_value(self.value)
+            return {
+                "=": f"IS_SAME({reference}, {value})",
+                "!=": f"NOT(IS_SAME({reference}, {value}))",
+                "<": f"IS_BEFORE({reference}, {value})",
+                "<=": f"NOT(IS_AFTER({reference}, {value}))",
+                ">": f"IS_AFTER({reference}, {value})",
+                ">=": f"NOT(IS_BEFORE({reference}, {value}))",
+            }[self.operator]
+        return f"{reference} {self.operator} {format_value(self.value)}"
+
+
+@dataclass(frozen=True)
+class Contains(Condition):
+    field: str
+    text: str
+
+    def compile(self) -> str:
+        # Works for text fields and multi-value fields (rendered comma separated)
+        return f"FIND({escape_string(self.text)}, {field_reference(self.field)} & '') > 0"
+
+
+@dataclass(frozen=True)
+class Empty(Condition):
+    field: str
+
+    def compile(self) -> str:
+        return f"{field_reference(self.field)} = BLANK()"
+
+
+@dataclass(frozen=True)
+class Raw(Condition):
+    """A formula written by hand."""
+    formula: str
+
+    def compile(self) -> str:
+        return self.formula
+
+
+@dataclass(frozen=True)
+class And(Condition):
+    conditions: Tuple[Condition, ...]
+
+    def compile(self) -> str:
+        parts = _flatten(self.conditions, And)
+        if len(parts) <= 1:
+            return parts[0].compile() if parts else "TRUE()"
+        return f"AND({', '.join(part.compile() for part in parts)})"
+
+
+@dataclass(frozen=True)
+class Or(Condition):
+    conditions: Tuple[Condition, ...]
+
+    def compile(self) -> str:
+        parts = _flatten(self.conditions, Or)
+        if len(parts) <= 1:
+            # one_of([]) matches nothing
+            return parts[0].compile() if parts else "FALSE()"
+        return f"OR({', '.join(part.compile() for part in parts)})"
+
+
+@dataclass(frozen=True)
+class Not(Condition):
+    condition: Condition
+
+    def compile(self) -> str:
+        return f"NOT({self.condition.compile()})"
+
+
+def _flatten(conditions: Iterable[Condition], kind: type) -> List[Condition]:
+    """Inline nested ANDs into an AND (ORs into an OR) to keep formulas short."""
+    parts: List[Condition] = []
+    for condition in conditions:
+        if isinstance(condition, kind):
+            parts.extend(_flatten(condition.conditions, kind))
+        else:
+            parts.append(condition)
+    return parts
+
+
+class Field:
+    """A field to build conditions on: ``Field("Score") >= 80``."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value: Any) -> Condition:  # type: ignore[override]
+        return Compare(self.name, "=", value)
+
+    def __ne__(self, value: Any) -> Condition:  # type: ignore[override]
+        return Compare(self.name, "!=", value)
+
+    def __lt__(self, value: Any) -> Condition:
+        return Compare(self.name, "<", value)
+
+    def __le__(self, value: Any) -> Condition:
+        return Compare(self.name, "<=", value)
+
+    def __gt__(self, value: Any) -> Condition:
+        return Compare(self.name, ">", value)
+
+    def __ge__(self, value: Any) -> Condition:
+        return Compare(self.name, ">=", value)
+
+    def contains(self, text: str) -> Condition:
+        return Contains(self.name, text)
+
+    def is_empty(self) -> Condition:
+        return Empty(self.name)
+
+    def not_empty(self) -> Condition:
+        return Not(Empty(self.name))
+
+    def one_of(self, values: Iterable[Any]) -> Condition:
+        return Or(tuple(Compare(self.name, "=", value) for value in values))
+
+    def between(self, start: Any, end: Any) -> Condition:
+        """``start <= value < end``; for dates this is a half-open range."""
+        return And((Compare(self.name, ">=", start), Compare(self.name, "<", end)))
+
+    def after(self, value: Any) -> Condition:
+        return Compare(self.name, ">", value)
+
+    def before(self, value: Any) -> Condition:
+        return Compare(self.name, "<", value)
+
+
+def where(*conditions: Condition, **equals: Any) -> Optional[Condition]:
+    """AND of ``conditions`` and ``field=value`` equalities (None if empty)."""
+    parts = tuple(conditions) + tuple(Compare(name, "=", value) for name, value in equals.items())
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else And(parts)
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def compile_formula(condition: Condition) -> str:
+    """Compile a condition to filterByFormula (memoized; conditions are immutable)."""
+    return condition.compile()
+
+
+class QueryCache:
+    """TTL cache of query results, shared by any queries given it."""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple, records: List[Dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), records)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, base_id: Optional[str] = None, table_name: Optional[str] = None) -> None:
+        """Drop cached results for a table, a base, or everything."""
+        with self._lock:
+            for key in list(self._entries):
+                if (base_id is None or key[0] == base_id) and (table_name is None or key[1] == table_name):
+                    del self._entries[key]
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(frozen=True)
+class Query:
+    """
+    An immutable query on one table; every builder method returns a new one.
+    Run it with ``iter()``, ``all()`` or ``first()``.
+    """
+    client: Any = field(compare=False)
+    table_name: str
+    condition: Optional[Condition] = None
+    field_names: Optional[Tuple[str, ...]] = None
+    sort_fields: Tuple[str, ...] = ()
+    max_records: Optional[int] = None
+    view_name: Optional[str] = None
+    cache: Optional[QueryCache] = field(default=None, compare=False)
+
+    def where(self, *conditions: Condition, **equals: Any) -> "Query":
+        """Add conditions (ANDed with any already given)."""
+        condition = where(*conditions, **equals)
+        if condition is None:
+            return self
+        if self.condition is not None:
+            condition = And((self.condition, condition))
+        return replace(self, condition=condition)
+
+    def fields(self, *names: str) -> "Query":
+        """Only return these fields."""
+        return replace(self, field_names=tuple(names))
+
+    def sort(self, *names: str) -> "Query":
+        """Sort by these fields; prefix a name with ``-`` for descending."""
+        return replace(self, sort_fields=tuple(names))
+
+    def limit(self, max_records: int) -> "Query":
+        return replace(self, max_records=max_records)
+
+    def view(self, name: str) -> "Query":
+        return replace(self, view_name=name)
+
+    def cached(self, cache: Optional[QueryCache]) -> "Query":
+        """Serve ``all()`` / ``first()`` from ``cache`` while fresh."""
+        return replace(self, cache=cache)
+
+    @property
+    def formula(self) -> Optional[str]:
+        return compile_formula(self.condition) if self.condition is not None else None
+
+    def options(self) -> Dict[str, Any]:
+        """Keyword arguments for AirtableClient.iter_pages()."""
+        options: Dict[str, Any] = {}
+        if self.condition is not None:
+            options["formula"] = self.formula
+        if self.field_names is not None:
+            options["fields"] = list(self.field_names)
+        if self.sort_fields:
+            options["sort"] = list(self.sort_fields)
+        if self.view_name:
+            options["view"] = self.view_name
+        if self.max_records is not None:
+            options["max_records"] = self.max_records
+            # Small limits don't need a full page
+            options["page_size"] = max(1, min(MAX_PAGE_SIZE, self.max_records))
+        return options
+
+    def _cache_key(self) -> Tuple:
+        return (self.client.base_id, self.table_name, self.formula, self.field_names,
+                self.sort_fields, self.view_name, self.max_records)
+
+    def iter(self) -> Iterator[Dict]:
+        """Yield matching records as pages arrive (never cached)."""
+        return self.client.iter_records(self.table_name, **self.options())
+
+    def all(self) -> List[Dict]:
+        """Every matching record, from the cache when one is attached and fresh."""
+        if self.cache is None:
+            return list(self.iter())
+        key = self._cache_key()
+        records = self.cache.get(key)
+        if records is None:
+            records = list(self.iter())
+            self.cache.put(key, records)
+        return list(records)
+
+    def first(self) -> Optional[Dict]:
+        records = self.limit(1).all()
+        return records[0] if records else None
@@ -0,0 +1,239 @@
+"""
+Async n8n API Client
+asyncio-native counterpart of N8nClient for fanning out many workflow calls
+from a single process.
+"""
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from n8n_client import (
+    DEFAULT_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    RETRY_STATUSES,
+    execution_list_params,
+    summarize_workflow,
+    workflow_list_params,
+)
+from rate_limit import FileTokenBucket, compute_backoff, get_breaker, get_bucket, parse_retry_after
+
+
+class AsyncN8nClient:
+    """Async client for interacting with n8n API."""
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_concurrency: int = 20,
+        requests_per_second: Optional[float] = None,
+        rate_limit_dir: Optional[str] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        api_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+    ):
+        """Options match N8nClient; rate limits and circuit breakers share its per-host state."""
+        self.api_url = api_url or os.getenv("N8N_API_URL")
+        self.api_token = api_token or os.getenv("N8N_API_TOKEN")
+
+        if not self.api_url or not self.api_token:
+            raise ValueError("N8N_API_URL and N8N_API_TOKEN must be set in .env file")
+
+        self.api_url = self.api_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+
+        self.headers = {
+            "X-N8N-API-KEY": self.api_token,
+            "Content-Type": "application/json"
+        }
+
+        connect_timeout, read_timeout = timeout
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+        host_key = f"n8n:{urlparse(self.api_url).netloc}"
+        self.bucket = (
+            get_bucket(host_key, requests_per_second, shared_dir=rate_limit_dir)
+            if requests_per_second else None
+        )
+        self.breaker = get_breaker(host_key, failure_threshold, recovery_timeout)
+
+        # Created on first use so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request under the concurrency limit, retrying transient failures."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        url = f"{self.api_url}{path}"
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            # Fail fast while the host is unhealthy instead of adding to the load
+            self.breaker.before_call()
+            if self.bucket is not None:
+                # A shared bucket waits on a file lock; keep that off the event loop
+                blocking = isinstance(self.bucket, FileTokenBucket)
+                while True:
+                    if blocking:
+                        wait = await asyncio.get_running_loop().run_in_executor(None, self.bucket.try_acquire)
+                    else:
+                        wait = self.bucket.try_acquire()
+                    if wait == 0:
+                        break
+                    await asyncio.sleep(wait)
+
+            try:
+                # The slot is only held for the request itself, not while
+                # backing off, so throttled calls don't starve the others
+                async with self._semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                # Connect failures never reached the server, so it is safe to
+                # resend any request; other transport errors only idempotent ones
+                retryable = isinstance(e, (httpx.ConnectTimeout, httpx.ConnectError)) or idempotent
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = compute_backoff(attempt, self.backoff_factor, self.max_backoff)
+            else:
+                status = response.status_code
+                if status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if (
+                    status not in RETRY_STATUSES
+                    or attempt >= self.max_retries
+                    or (status != 429 and not idempotent)
+                ):
+                    return response
+                delay = compute_backoff(
+                    attempt,
+                    self.backoff_factor,
+                    self.max_backoff,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                )
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def iter_workflows(
+        self,
+        active: Optional[bool] = None,
+        tags: Optional[Union[str, Iterable[str]]] = None,
+        name: Optional[str] = None,
+        limit: int = 100,
+        summary: bool = False,
+    ) -> AsyncIterator[Dict]:
+        """Iterate over workflows page by page, following ``nextCursor``."""
+        params = workflow_list_params(active, tags, name, limit, summary)
+        while True:
+            response = await self._request("GET", "/workflows", params=params)
+            response.raise_for_status()
+            page = response.json()
+            for workflow in page.get("data", []):
+                yield summarize_workflow(workflow) if summary else workflow
+
+            cursor = page.get("nextCursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    async def get_workflows(self, **filters) -> List[Dict]:
+        """Get all workflows from n8n (accepts the same filters as iter_workflows)."""
+        return [workflow async for workflow in self.iter_workflows(**filters)]
+
+    async def get_workflow(self, workflow_id: str) -> Dict:
+        """Get a specific workflow by ID."""
+        response = await self._request("GET", f"/workflows/{workflow_id}")
+        response.raise_for_status()
+        return response.json()
+
+    async def iter_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        include_data: bool = False,
+        limit: int = 100,
+    ) -> AsyncIterator[Dict]:
+        """Iterate over executions, newest first, following ``nextCursor``."""
+        params = execution_list_params(workflow_id, status, include_data, limit)
+        while True:
+            response = await self._request("GET", "/executions", params=params)
+            response.raise_for_status()
+            page = response.json()
+            for execution in page.get("data", []):
+                yield execution
+
+            cursor = page.get("nextCursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    async def get_execution(self, execution_id: str, include_data: bool = False) -> Dict:
+        """Get a specific execution by ID."""
+        params = {"includeData": "true"} if include_data else None
+        response = await self._request("GET", f"/executions/{execution_id}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def create_workflow(self, workflow_data: Dict) -> Dict:
+        """Create a new workflow in n8n."""
+        response = await self._request("POST", "/workflows", json=workflow_data)
+        if response.status_code >= 400:
+            print(f"Error Response: {response.text}")
+        response.raise_for_status()
+        return response.json()
+
+    async def update_workflow(self, workflow_id: str, workflow_data: Dict) -> Dict:
+        """Update an existing workflow."""
+        response = await self._request("PATCH", f"/workflows/{workflow_id}", json=workflow_data)
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_workflow(self, workflow_id: str) -> None:
+        """Delete a workflow."""
+        response = await self._request("DELETE", f"/workflows/{workflow_id}")
+        response.raise_for_status()
+
+    async def activate_workflow(self, workflow_id: str) -> Dict:
+        """Activate a workflow."""
+        return await self.update_workflow(workflow_id, {"active": True})
+
+    async def deactivate_workflow(self, workflow_id: str) -> Dict:
+        """Deactivate a workflow."""
+        return await self.update_workflow(workflow_id, {"active": False})
+
+    async def execute_workflow(self, workflow_id: str, data: Optional[Dict] = None) -> Dict:
+        """Execute a workflow."""
+        response = await self._request("POST", f"/workflows/{workflow_id}/execute", json=data or {})
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,246 @@
+"""
+Client Benchmarks
+Micro-benchmarks of N8nClient and AirtableClient against local fake APIs.
+
+Each benchmark runs one hot client operation against the in-process fakes in
+benchmarks/fake_apis.py (no network access needed) and records:
+
+- ops/sec over the timed repetitions (after a warm-up run)
+- requests and bytes transferred per operation
+- peak Python memory allocated during one operation (tracemalloc, measured
+  in a separate run so tracing doesn't skew the timings)
+
+Results can be saved as a baseline and later runs checked against it; the
+command fails if throughput dropped or peak memory grew beyond the threshold.
+Numbers depend on the machine, so compare against a baseline recorded on the
+same one.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airtable_client import AirtableClient
+from airtable_bulk import BulkWriter
+from benchmarks.fake_apis import (
+    AIRTABLE_BASE_ID,
+    AIRTABLE_TABLE,
+    N8N_API_PREFIX,
+    FakeAirtable,
+    FakeN8n,
+    FakeServer,
+    make_workflow,
+)
+from n8n_client import N8nClient
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "clients.json")
+
+# Effectively no client-side pacing: the fakes should be the only limit
+UNPACED = 1e9
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    repeat: int
+    ops_per_sec: float
+    mean_seconds: float
+    best_seconds: float
+    requests_per_op: float
+    bytes_in_per_op: float
+    bytes_out_per_op: float
+    peak_memory_bytes: int
+
+
+@dataclass
+class Benchmark:
+    name: str
+    server: FakeServer
+    operation: Callable[[], object]
+
+
+def measure(benchmark: Benchmark, repeat: int) -> BenchmarkResult:
+    """Warm up, time ``repeat`` runs, then trace one run's peak memory."""
+    benchmark.operation()
+
+    before = benchmark.server.counters()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        benchmark.operation()
+        timings.append(time.perf_counter() - started)
+    after = benchmark.server.counters()
+    requests, bytes_in, bytes_out = (b - a for a, b in zip(before, after))
+
+    tracemalloc.start()
+    try:
+        benchmark.operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mean = sum(timings) / len(timings)
+    return BenchmarkResult(
+        name=benchmark.name,
+        repeat=repeat,
+        ops_per_sec=round(1.0 / mean, 3) if mean else 0.0,
+        mean_seconds=round(mean, 5),
+        best_seconds=round(min(timings), 5),
+        # Bytes as seen by the server: request bodies (plus request line and
+        # headers) in, response bodies out
+        requests_per_op=round(requests / repeat, 1),
+        bytes_in_per_op=round(bytes_in / repeat),
+        bytes_out_per_op=round(bytes_out / repeat),
+        peak_memory_bytes=peak,
+    )
+
+
+def build_benchmarks(n8n: FakeN8n, airtable: FakeAirtable, batch_records: int) -> List[Benchmark]:
+    n8n_client = N8nClient(api_url=n8n.url + N8N_API_PREFIX, api_token="benchmark", max_retries=0)
+    airtable_client = AirtableClient(
+        api_token="benchmark",
+        base_id=AIRTABLE_BASE_ID,
+        endpoint_url=airtable.url,
+        requests_per_second=UNPACED,
+        bulk_writer=BulkWriter(max_retries=0),
+    )
+    new_workflow = {key: value for key, value in make_workflow(0, 50).items()
+                    if key in ("name", "nodes", "connections", "settings")}
+    new_records = [{"Topic": f"Topic {i}", "Score": i % 100} for i in range(batch_records)]
+    updates = [{"id": f"rec{i:014d}", "fields": {"Score": i % 100}} for i in range(batch_records)]
+
+    return [
+        Benchmark(f"n8n.get_workflows[{len(n8n.workflows)}]", n8n, lambda: n8n_client.get_workflows()),
+        Benchmark(f"n8n.get_workflows[{len(n8n.workflows)},summary]", n8n,
+                  lambda: n8n_client.get_workflows(summary=True)),
+        Benchmark("n8n.get_workflow[large graph]", n8n, lambda: n8n_client.get_workflow(n8n.large_workflow_id)),
+        Benchmark("n8n.create_workflow[50 nodes]", n8n, lambda: n8n_client.create_workflow(new_workflow)),
+        Benchmark(f"airtable.get_records[{airtable.total}]", airtable,
+                  lambda: airtable_client.get_records(AIRTABLE_TABLE)),
+        Benchmark(f"airtable.iter_records[{airtable.total}]", airtable,
+                  lambda: sum(1 for _ in airtable_client.iter_records(AIRTABLE_TABLE))),
+        Benchmark(f"airtable.batch_create[{batch_records}]", airtable,
+                  lambda: airtable_client.batch_create(AIRTABLE_TABLE, new_records)),
+        Benchmark(f"airtable.batch_update[{batch_records}]", airtable,
+                  lambda: airtable_client.batch_update(AIRTABLE_TABLE, updates)),
+    ]
+
+
+def compare(baseline: Dict, results: List[BenchmarkResult], threshold: float) -> List[Dict]:
+    """
+    Compare results with a baseline report. A benchmark regressed if its
+    ops/sec dropped, or its peak memory grew, by more than ``threshold``.
+    """
+    previous = {entry["name"]: entry for entry in baseline.get("results", [])}
+    comparison = []
+    for result in results:
+        before = previous.get(result.name)
+        if before is None:
+            continue
+        speed = (result.ops_per_sec - before["ops_per_sec"]) / before["ops_per_sec"] if before["ops_per_sec"] else 0.0
+        memory = ((result.peak_memory_bytes - before["peak_memory_bytes"]) / before["peak_memory_bytes"]
+                  if before["peak_memory_bytes"] else 0.0)
+        comparison.append({
+            "name": result.name,
+            "ops_per_sec_change": round(speed, 4),
+            "peak_memory_change": round(memory, 4),
+            "regression": speed < -threshold or memory > threshold,
+        })
+    return comparison
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the client benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark N8nClient and AirtableClient against fake APIs")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--workflows", type=int, default=2000, help="workflows on the fake n8n instance")
+    parser.add_argument("--records", type=int, default=100_000, help="rows in the fake Airtable table")
+    parser.add_argument("--batch-records", type=int, default=1000, help="records per batch create/update")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE_PATH, metavar="PATH",
+                        help=f"save results as the baseline (default: {os.path.relpath(DEFAULT_BASELINE_PATH)})")
+    parser.add_argument("--check", nargs="?", const=DEFAULT_BASELINE_PATH, metavar="PATH",
+                        help="compare with a saved baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="fractional slowdown / memory growth tolerated by --check (default: 0.15)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    # Checked before running anything: a first run would otherwise take minutes to fail
+    if args.check and not args.save_baseline and not os.path.exists(args.check):
+        print(f"❌ No baseline at {args.check}; record one on this machine first with:")
+        target = "" if args.check == DEFAULT_BASELINE_PATH else f" {args.check}"
+        print(f"   python benchmarks/client_bench.py --save-baseline{target}")
+        return 1
+
+    n8n = FakeN8n(workflows=args.workflows)
+    airtable = FakeAirtable(records=args.records)
+    airtable.warm()
+
+    results: List[BenchmarkResult] = []
+    try:
+        for benchmark in build_benchmarks(n8n, airtable, args.batch_records):
+            if args.filter and args.filter not in benchmark.name:
+                continue
+            result = measure(benchmark, args.repeat)
+            results.append(result)
+            if not args.json:
+                print(
+                    f"⏱️  {result.name:<40} {result.ops_per_sec:>10.2f} ops/s  "
+                    f"{result.requests_per_op:>6.0f} req  ↓{_format_bytes(result.bytes_out_per_op):>7}  "
+                    f"↑{_format_bytes(result.bytes_in_per_op):>7}  peak {_format_bytes(result.peak_memory_bytes)}",
+                    flush=True,
+                )
+    finally:
+        n8n.close()
+        airtable.close()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        if not args.json:
+            print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            comparison = compare(json.load(f), results, args.threshold)
+        if not args.json:
+            print(f"\n📊 Compared with {args.check}")
+            for entry in comparison:
+                marker = "🔴" if entry["regression"] else "🟢"
+                print(f"{marker} {entry['name']:<40} ops/s {entry['ops_per_sec_change']:+.1%}  "
+                      f"peak memory {entry['peak_memory_change']:+.1%}")
+        if any(entry["regression"] for entry in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
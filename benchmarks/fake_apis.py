@@ -0,0 +1,213 @@
+"""
+Fake APIs
+In-process fake n8n and Airtable HTTP servers for client benchmarks.
+
+They implement just enough of each API for N8nClient and AirtableClient:
+cursor-paginated workflow listings, workflow bodies and creation for n8n;
+offset-paginated record listings and batch create/update for Airtable.
+Response bodies are serialized once up front so the servers spend as little
+of the shared interpreter's time as possible, and every byte read or written
+is counted so benchmarks can report transfer sizes.
+"""
+
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+N8N_API_PREFIX = "/api/v1"
+AIRTABLE_BASE_ID = "appBenchmark00001"
+AIRTABLE_TABLE = "Records"
+
+
+def make_workflow(index: int, nodes: int) -> Dict:
+    """A workflow shaped like the ones in workflows/ with ``nodes`` chained nodes."""
+    names = [f"Node {i}" for i in range(nodes)]
+    return {
+        "id": f"wf{index:06d}",
+        "name": f"Benchmark Workflow {index}",
+        "active": index % 2 == 0,
+        "createdAt": "2026-01-01T00:00:00.000Z",
+        "updatedAt": "2026-01-01T00:00:00.000Z",
+        "nodes": [
+            {
+                "parameters": {
+                    "jsCode": f"// step {i}\nreturn items.map(item => ({{ json: {{ ...item.json, step: {i} }} }}));"
+                },
+                "type": "n8n-nodes-base.code",
+                "typeVersion": 2,
+                "position": [240 + 220 * i, 300],
+                "id": str(uuid.UUID(int=index * 100000 + i)),
+                "name": name,
+            }
+            for i, name in enumerate(names)
+        ],
+        "connections": {
+            source: {"main": [[{"node": target, "type": "main", "index": 0}]]}
+            for source, target in zip(names, names[1:])
+        },
+        "settings": {},
+        "tags": [],
+    }
+
+
+def make_record(index: int) -> Dict:
+    return {
+        "id": f"rec{index:014d}",
+        "createdTime": "2026-01-01T00:00:00.000Z",
+        "fields": {
+            "Topic": f"Topic {index}",
+            "Poem": "Roses are red, violets are blue, benchmarks are fast and so are you.",
+            "Joke": "Why did the benchmark cross the road? To measure the other side.",
+            "Score": index % 100,
+            "Published": index % 3 == 0,
+        },
+    }
+
+
+class FakeServer:
+    """Base for the fakes: a threaded HTTP server on an ephemeral port with byte counters."""
+
+    def __init__(self):
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = fake.route(self.command, urlparse(self.path), body)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with fake._lock:
+                    fake.requests += 1
+                    fake.bytes_in += length + len(self.requestline) + len(str(self.headers))
+                    fake.bytes_out += len(payload)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def counters(self) -> Tuple[int, int, int]:
+        with self._lock:
+            return self.requests, self.bytes_in, self.bytes_out
+
+    def route(self, method: str, url, body: Optional[Dict]) -> Tuple[int, bytes]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeN8n(FakeServer):
+    """Fake n8n public API with ``workflows`` workflows of ``nodes`` nodes each."""
+
+    def __init__(self, workflows: int = 2000, nodes: int = 20, large_nodes: int = 500):
+        self.workflows = [make_workflow(i, nodes) for i in range(workflows)]
+        self._bodies = {wf["id"]: json.dumps(wf).encode("utf-8") for wf in self.workflows}
+        # One extra workflow with a large graph for single-workflow fetches
+        large = make_workflow(workflows, large_nodes)
+        self.large_workflow_id = large["id"]
+        self._bodies[large["id"]] = json.dumps(large).encode("utf-8")
+        self._pages: Dict[Tuple[int, int], bytes] = {}
+        super().__init__()
+
+    def _page(self, offset: int, limit: int) -> bytes:
+        key = (offset, limit)
+        if key not in self._pages:
+            data = self.workflows[offset:offset + limit]
+            next_offset = offset + limit
+            cursor = str(next_offset) if next_offset < len(self.workflows) else None
+            self._pages[key] = json.dumps({"data": data, "nextCursor": cursor}).encode("utf-8")
+        return self._pages[key]
+
+    def route(self, method, url, body):
+        path = url.path[len(N8N_API_PREFIX):] if url.path.startswith(N8N_API_PREFIX) else url.path
+        if path == "/workflows" and method == "GET":
+            params = parse_qs(url.query)
+            limit = int(params.get("limit", ["100"])[0])
+            offset = int(params.get("cursor", ["0"])[0])
+            return 200, self._page(offset, limit)
+        if path == "/workflows" and method == "POST":
+            created = dict(body or {}, id=uuid.uuid4().hex[:16], active=False)
+            return 200, json.dumps(created).encode("utf-8")
+        if path.startswith("/workflows/"):
+            workflow_id = path.split("/")[2]
+            if workflow_id not in self._bodies:
+                return 404, b'{"message": "Not Found"}'
+            if method == "GET":
+                return 200, self._bodies[workflow_id]
+            if method == "PATCH":
+                updated = dict(json.loads(self._bodies[workflow_id]), **(body or {}))
+                return 200, json.dumps(updated).encode("utf-8")
+        return 404, b'{"message": "Not Found"}'
+
+
+class FakeAirtable(FakeServer):
+    """Fake Airtable API with one table of ``records`` rows."""
+
+    def __init__(self, records: int = 100_000):
+        self.total = records
+        self._pages: Dict[Tuple[int, int], bytes] = {}
+        super().__init__()
+
+    def _page(self, offset: int, size: int) -> bytes:
+        key = (offset, size)
+        if key not in self._pages:
+            end = min(offset + size, self.total)
+            payload: Dict = {"records": [make_record(i) for i in range(offset, end)]}
+            if end < self.total:
+                payload["offset"] = str(end)
+            self._pages[key] = json.dumps(payload).encode("utf-8")
+        return self._pages[key]
+
+    def route(self, method, url, body):
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "v0" or parts[1] != AIRTABLE_BASE_ID:
+            return 404, b'{"error": "NOT_FOUND"}'
+        if method == "GET":
+            params = parse_qs(url.query)
+            size = int(params.get("pageSize", ["100"])[0])
+            offset = int(params.get("offset", ["0"])[0])
+            return 200, self._page(offset, size)
+        records: List[Dict] = (body or {}).get("records", [])
+        if method == "POST":
+            created = [
+                {"id": f"rec{uuid.uuid4().hex[:14]}", "createdTime": "2026-01-01T00:00:00.000Z",
+                 "fields": record.get("fields", {})}
+                for record in records
+            ]
+            return 200, json.dumps({"records": created}).encode("utf-8")
+        if method == "PATCH":
+            updated = [
+                {"id": record["id"], "createdTime": "2026-01-01T00:00:00.000Z", "fields": record.get("fields", {})}
+                for record in records
+            ]
+            return 200, json.dumps({"records": updated}).encode("utf-8")
+        return 404, b'{"error": "NOT_FOUND"}'
+
+    def warm(self, page_size: int = 100) -> None:
+        """Serialize every listing page up front."""
+        for offset in range(0, self.total, page_size):
+            self._page(offset, page_size)
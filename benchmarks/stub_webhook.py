@@ -0,0 +1,196 @@
+"""
+Stub Webhook
+Local stand-in for the poem & joke webhooks with configurable latency.
+
+Answers POSTs with the same contract as the n8n workflows: ``success``,
+``topic``, ``poem`` and ``joke`` for the combined webhook, or ``part`` and
+``text`` when the request names a ``part``. Response times are drawn from a
+latency distribution, and a share of requests can be failed on purpose, so
+load tests and the webhook proxy can be exercised without n8n or OpenAI.
+
+Distributions are given as ``kind:args`` (seconds):
+
+- ``fixed:4``             always 4s
+- ``uniform:2,6``         between 2s and 6s
+- ``normal:4,1``          mean 4s, standard deviation 1s (clipped at 0)
+- ``lognormal:4,0.5``     median 4s, sigma 0.5 (long right tail, like LLM calls)
+- ``exp:4``               exponential with mean 4s
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+# Seconds to sleep before answering
+LatencySampler = Callable[[], float]
+
+
+def parse_distribution(spec: str) -> LatencySampler:
+    """Build a latency sampler from a ``kind:args`` spec (see module docstring)."""
+    kind, _, raw_args = spec.partition(":")
+    try:
+        args = [float(value) for value in raw_args.split(",") if value]
+    except ValueError:
+        raise ValueError(f"Invalid latency distribution '{spec}'") from None
+
+    kind = kind.strip().lower()
+    if kind == "fixed" and len(args) == 1:
+        return lambda: args[0]
+    if kind == "uniform" and len(args) == 2:
+        return lambda: random.uniform(args[0], args[1])
+    if kind == "normal" and len(args) == 2:
+        return lambda: max(0.0, random.gauss(args[0], args[1]))
+    if kind == "lognormal" and len(args) == 2:
+        return lambda: random.lognormvariate(math.log(args[0]), args[1])
+    if kind == "exp" and len(args) == 1:
+        return lambda: random.expovariate(1.0 / args[0]) if args[0] > 0 else 0.0
+    raise ValueError(f"Invalid latency distribution '{spec}'")
+
+
+class StubState:
+    """Behaviour and counters shared by the stub's request handlers."""
+
+    def __init__(self, latency: LatencySampler, error_rate: float = 0.0, error_status: int = 500):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST like the webhook; ``GET /stats`` reports counters."""
+
+    state: StubState
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this Nagle's
+    # algorithm holds the body back for a delayed ACK (~40ms per response)
+    disable_nagle_algorithm = True
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.state.stats())
+        else:
+            self._send_json(404, {"success": False, "error": "Not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            request = {}
+        topic = request.get("topic") or "AI and creativity"
+
+        state = self.state
+        with state._lock:
+            state.requests += 1
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        failed = False
+        try:
+            time.sleep(state.latency())
+            failed = random.random() < state.error_rate
+        finally:
+            with state._lock:
+                state.in_flight -= 1
+                if failed:
+                    state.errors += 1
+
+        if failed:
+            self._send_json(state.error_status, {"success": False, "error": "Injected failure"})
+            return
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+        part = request.get("part")
+        if part:
+            self._send_json(200, {
+                "success": True, "topic": topic, "part": part,
+                "text": f"A {part} about {topic} #stub", "timestamp": timestamp,
+            })
+        else:
+            self._send_json(200, {
+                "success": True, "topic": topic,
+                "poem": f"Roses are red,\nstubs are fast,\n{topic} at last. #stub",
+                "joke": f"Why did {topic} cross the road? To hit the stub. #stub",
+                "timestamp": timestamp,
+            })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(latency: str = "lognormal:4,0.5", error_rate: float = 0.0, host: str = "127.0.0.1",
+               port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start a stub server on a background thread and return it; its URL is
+    ``http://{host}:{server.server_port}/``. Call ``shutdown()`` to stop it.
+    """
+    state = StubState(parse_distribution(latency), error_rate)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the stub webhook in the foreground."""
+    parser = argparse.ArgumentParser(description="Stub poem & joke webhook with configurable latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--latency", default="lognormal:4,0.5", help="latency distribution, e.g. uniform:2,6")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    args = parser.parse_args(argv)
+
+    try:
+        server = start_stub(args.latency, args.error_rate, args.host, args.port)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    print("🧪 Stub webhook running")
+    print("=" * 50)
+    print(f"📡 URL:     http://{args.host}:{server.server_port}/")
+    print(f"⏱️  Latency: {args.latency}")
+    print(f"💥 Errors:  {args.error_rate:.0%}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Webhook Load Test
+Throughput and latency benchmark for the poem & joke webhook.
+
+Targets a real webhook (or the webhook proxy) with ``--url``, or the bundled
+stub with ``--stub``. Two load profiles are supported:
+
+- closed loop (``--concurrency N``): N workers each send their next request
+  as soon as the previous one returns, which measures capacity
+- open loop (``--rate R``): requests arrive at R per second (Poisson by
+  default) regardless of how fast earlier ones finish, which measures how
+  latency degrades under a given traffic level. Latency is measured from the
+  scheduled arrival, so queueing behind a slow server is not hidden.
+
+The JSON report can be saved with ``--output`` and compared with an earlier
+run with ``--compare``; the command fails if latency or error rate regressed
+beyond ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from benchmarks.stub_webhook import start_stub
+from execution_metrics import summarize
+
+# Fields compared between runs; higher is worse for all of them
+COMPARED_METRICS = ("latency.p50", "latency.p95", "latency.p99", "error_rate")
+
+
+class LoadTest:
+    """Sends requests to a webhook and records the outcome of each."""
+
+    def __init__(self, url: str, topics: List[str], timeout: float = 120.0, pool_size: int = 100):
+        self.url = url
+        self.topics = topics
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.latencies: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.errors = 0
+        self._sent = 0
+        self._lock = threading.Lock()
+
+    def _next_topic(self) -> str:
+        with self._lock:
+            topic = self.topics[self._sent % len(self.topics)]
+            self._sent += 1
+        return topic
+
+    def send(self, scheduled: Optional[float] = None) -> None:
+        """Send one request; latency counts from ``scheduled`` if given."""
+        started = scheduled if scheduled is not None else time.monotonic()
+        try:
+            response = self.session.post(self.url, json={"topic": self._next_topic()}, timeout=self.timeout)
+        except requests.RequestException as e:
+            status, ok = type(e).__name__, False
+        else:
+            status = str(response.status_code)
+            try:
+                body = response.json()
+            except ValueError:  # not JSON: counted as a failure under its HTTP status
+                body = None
+            ok = response.ok and isinstance(body, dict) and body.get("success") is True
+        latency = time.monotonic() - started
+
+        with self._lock:
+            self.latencies.append(latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if not ok:
+                self.errors += 1
+
+    def run_closed(self, concurrency: int, duration: Optional[float], requests_total: Optional[int]) -> float:
+        """Closed loop: ``concurrency`` workers send back to back. Returns elapsed seconds."""
+        started = time.monotonic()
+        deadline = started + duration if duration else None
+        remaining = [requests_total]
+
+        def claim() -> bool:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            with self._lock:
+                if remaining[0] is None:
+                    return True
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+                return True
+
+        def worker() -> None:
+            while claim():
+                self.send()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.monotonic() - started
+
+    def run_open(self, rate: float, duration: Optional[float], requests_total: Optional[int],
+                 poisson: bool = True, max_in_flight: int = 1000) -> float:
+        """Open loop: requests arrive at ``rate`` per second. Returns elapsed seconds."""
+        started = time.monotonic()
+        next_arrival = started
+        sent = 0
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            while True:
+                if requests_total is not None and sent >= requests_total:
+                    break
+                if duration is not None and next_arrival - started >= duration:
+                    break
+                delay = next_arrival - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, next_arrival)
+                sent += 1
+                next_arrival += random.expovariate(rate) if poisson else 1.0 / rate
+        return time.monotonic() - started
+
+    def report(self, elapsed: float, config: Dict) -> Dict:
+        total = len(self.latencies)
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "config": config,
+            "requests": total,
+            "succeeded": total - self.errors,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "statuses": self.statuses,
+            "elapsed": round(elapsed, 3),
+            "throughput": round((total - self.errors) / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency": summarize(self.latencies),
+        }
+
+
+def _metric(report: Dict, path: str) -> float:
+    value = report
+    for part in path.split("."):
+        value = value[part]
+    return float(value)
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+    Compare latency percentiles, error rate and throughput of two reports.
+    An entry is a regression when it is worse by more than ``threshold``
+    (a fraction, e.g. 0.1 for 10%).
+    """
+    comparison = []
+    for path in COMPARED_METRICS + ("throughput",):
+        before, after = _metric(baseline, path), _metric(current, path)
+        change = (after - before) / before if before else (0.0 if after == before else float("inf"))
+        worse = -change if path == "throughput" else change
+        comparison.append({
+            "metric": path,
+            "baseline": before,
+            "current": after,
+            "change": round(change, 4) if change != float("inf") else None,
+            "regression": worse > threshold,
+        })
+    return comparison
+
+
+def format_report(report: Dict) -> str:
+    latency = report["latency"]
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(report["statuses"].items()))
+    return "\n".join([
+        f"📨 Requests:   {report['requests']} ({statuses})",
+        f"❌ Errors:     {report['errors']} ({report['error_rate']:.1%})",
+        f"⚡ Throughput: {report['throughput']:.2f} req/s over {report['elapsed']:.1f}s",
+        f"⏱️  Latency:    p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  "
+        f"p99 {latency['p99']:.3f}s  max {latency['max']:.3f}s",
+    ])
+
+
+def format_comparison(comparison: List[Dict]) -> str:
+    lines = []
+    for entry in comparison:
+        change = "n/a" if entry["change"] is None else f"{entry['change']:+.1%}"
+        marker = "🔴" if entry["regression"] else "🟢"
+        lines.append(
+            f"{marker} {entry['metric']:<12} {entry['baseline']:>10.3f} → {entry['current']:<10.3f} ({change})"
+        )
+    return "\n".join(lines)
+
+
+def load_topics(path: Optional[str], pool: int) -> List[str]:
+    """Topics from a text file (one per line), or ``pool`` synthetic ones."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            topics = [line.strip() for line in f if line.strip()]
+        if topics:
+            return topics
+    return [f"load test topic {i}" for i in range(pool)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a load test and print (and optionally save / compare) the report."""
+    parser = argparse.ArgumentParser(description="Load test the poem & joke webhook")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="webhook (or webhook proxy) URL to test")
+    target.add_argument("--stub", action="store_true", help="test the bundled stub webhook")
+    parser.add_argument("--stub-latency", default="lognormal:4,0.5", help="stub latency distribution")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="share of stub requests that fail")
+
+    profile = parser.add_mutually_exclusive_group()
+    profile.add_argument("--concurrency", type=int, help="closed loop with this many workers (default: 10)")
+    profile.add_argument("--rate", type=float, help="open loop at this many requests per second")
+    parser.add_argument("--constant", action="store_true", help="open loop with constant (not Poisson) arrivals")
+    parser.add_argument("--duration", type=float, help="seconds to send for (default: 30 unless --requests)")
+    parser.add_argument("--requests", type=int, help="total requests to send")
+    parser.add_argument("--topics", help="file of topics to cycle through (one per line)")
+    parser.add_argument("--topic-pool", type=int, default=1000,
+                        help="number of synthetic topics when --topics isn't given (repeats hit caches)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with an earlier JSON report")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fractional regression tolerated by --compare (default: 0.1)")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of text")
+    args = parser.parse_args(argv)
+
+    duration = args.duration if args.duration or args.requests else 30.0
+
+    stub = None
+    url = args.url
+    if args.stub:
+        try:
+            stub = start_stub(args.stub_latency, args.stub_error_rate)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        url = f"http://127.0.0.1:{stub.server_port}/"
+
+    if args.rate:
+        config = {"profile": "open", "rate": args.rate, "arrivals": "constant" if args.constant else "poisson"}
+    else:
+        config = {"profile": "closed", "concurrency": args.concurrency or 10}
+    config.update({
+        "target": "stub" if stub else url,
+        "stub_latency": args.stub_latency if stub else None,
+        "duration": duration,
+        "requests": args.requests,
+    })
+
+    test = LoadTest(url, load_topics(args.topics, args.topic_pool), timeout=args.timeout)
+    if not args.json:
+        print("🏋️  Webhook load test")
+        print("=" * 50)
+        print(f"🎯 Target:  {config['target']}")
+        print(f"📈 Profile: {json.dumps({k: v for k, v in config.items() if v is not None and k != 'target'})}")
+
+    try:
+        if args.rate:
+            elapsed = test.run_open(args.rate, duration, args.requests, poisson=not args.constant)
+        else:
+            elapsed = test.run_closed(config["concurrency"], duration, args.requests)
+    finally:
+        if stub is not None:
+            stub.shutdown()
+            stub.server_close()
+
+    report = test.report(elapsed, config)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("=" * 50)
+        print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        if not args.json:
+            print(f"\n💾 Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        comparison = compare_reports(baseline, report, args.threshold)
+        if not args.json:
+            print(f"\n📊 Compared with {args.compare}")
+            print(format_comparison(comparison))
+        if any(entry["regression"] for entry in comparison):
+            if not args.json:
+                print(f"\n❌ Regression beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Bulk Generate
+Generate poems and jokes for a file of topics through the webhook.
+
+Topics are read from CSV (a ``topic`` column, else the first one), JSONL
+(``{"topic": ...}``) or plain text, and sent with bounded concurrency and an
+optional request-rate cap. Results stream to a JSONL file; every finished
+topic is also appended to a checkpoint file, so rerunning the same command
+after a crash skips what is already done. Throughput and latency are printed
+while the run progresses.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+import requests
+
+from execution_metrics import summarize
+from rate_limit import compute_backoff, get_bucket, parse_retry_after
+from webhook_proxy import UPSTREAM_TIMEOUT, default_webhook_url, normalize_topic
+
+# Statuses worth retrying; a webhook execution that failed with 5xx may
+# already have called OpenAI, but regenerating is the only way to get a result
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Generates the content for one topic and returns the response body
+Generator = Callable[[str], Dict]
+
+
+@dataclass
+class TopicResult:
+    """Outcome of one topic, written as a JSONL line."""
+    topic: str
+    key: str
+    ok: bool
+    latency: float
+    attempts: int
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    finished_at: str = ""
+
+
+def read_topics(path: str) -> Iterator[str]:
+    """
+    Yield topics from a CSV, JSONL or plain text file. Blank topics (empty
+    lines, empty cells) are skipped rather than falling back to the default
+    topic.
+    """
+    for topic in _raw_topics(path):
+        if topic is not None and str(topic).strip():
+            yield str(topic)
+
+
+def _raw_topics(path: str) -> Iterator[Optional[str]]:
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            # Blank lines come back as empty rows; the header is the first real one
+            reader = (row for row in csv.reader(f) if row)
+            header = next(reader, None)
+            if header is None:
+                return
+            names = [name.strip().lower() for name in header]
+            column = 0
+            if "topic" in names:
+                column = names.index("topic")
+            else:
+                # No header row: the first line is a topic too
+                yield header[0]
+            for row in reader:
+                if len(row) > column:
+                    yield row[column]
+        elif extension in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    data = json.loads(line)
+                    yield data.get("topic") if isinstance(data, dict) else data
+        else:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Normalized topics already finished by a previous run."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def webhook_generator(url: str, timeout=UPSTREAM_TIMEOUT) -> Generator:
+    """Generator posting ``{"topic": ...}`` to a webhook."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=64, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    def generate(topic: str) -> Dict:
+        response = session.post(url, json={"topic": topic}, timeout=timeout)
+        response.raise_for_status()
+        body = response.json()
+        if not isinstance(body, dict) or not body.get("success"):
+            raise ValueError("Webhook did not return a successful result")
+        return body
+
+    return generate
+
+
+def workflow_generator(workflow_id: str) -> Generator:
+    """Generator running a workflow through N8nClient.execute_workflow()."""
+    from n8n_client import N8nClient
+
+    client = N8nClient(max_retries=0)
+
+    def generate(topic: str) -> Dict:
+        return client.execute_workflow(workflow_id, {"topic": topic})
+
+    return generate
+
+
+class BulkRunner:
+    """Runs a generator over many topics with bounded concurrency."""
+
+    def __init__(
+        self,
+        generate: Generator,
+        concurrency: int = 8,
+        requests_per_second: Optional[float] = None,
+        rate_key: str = "bulk-generate",
+        max_retries: int = 2,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 30.0,
+        stats_interval: float = 5.0,
+    ):
+        """
+        Args:
+            generate: Called once per attempt with the topic.
+            concurrency: Topics in flight at once.
+            requests_per_second: Cap on attempts per second, shared with every
+                runner using the same ``rate_key``. None disables the cap.
+            max_retries: Retries per topic after 429/5xx or network errors.
+            stats_interval: Seconds between progress lines (0 disables them).
+        """
+        self.generate = generate
+        self.concurrency = concurrency
+        self.bucket = get_bucket(rate_key, requests_per_second) if requests_per_second else None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.stats_interval = stats_interval
+        self.latencies: List[float] = []
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self._started = 0.0
+        self._last_report = 0.0
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying after ``error``, or None if it isn't retryable."""
+        retry_after = None
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            if response is None or response.status_code not in RETRY_STATUSES:
+                return None
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        elif not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return None
+        return compute_backoff(attempt, self.backoff_factor, self.max_backoff, retry_after)
+
+    def run_topic(self, topic: str) -> TopicResult:
+        """Generate one topic, retrying transient failures."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            try:
+                body = self.generate(topic)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt) if attempt < self.max_retries else None
+                if delay is None:
+                    return TopicResult(topic, normalize_topic(topic), False,
+                                       round(time.monotonic() - started, 3), attempt + 1, error=str(e))
+                time.sleep(delay)
+                attempt += 1
+                continue
+            return TopicResult(topic, normalize_topic(topic), True,
+                               round(time.monotonic() - started, 3), attempt + 1, result=body)
+
+    def run(self, topics: Iterator[str], output_path: str, checkpoint_path: str) -> Dict:
+        """
+        Generate every topic not in the checkpoint, appending results to
+        ``output_path`` and finished topics to ``checkpoint_path``.
+        """
+        done = load_checkpoint(checkpoint_path)
+        seen: Set[str] = set()
+        self._started = self._last_report = time.monotonic()
+
+        def pending() -> Iterator[str]:
+            for topic in topics:
+                key = normalize_topic(topic)
+                if key in done or key in seen:
+                    self.skipped += 1
+                    continue
+                seen.add(key)
+                yield topic
+
+        # Only this thread writes, so output and checkpoint need no locking;
+        # a result is in the output file before its topic is checkpointed
+        with open(output_path, "a", encoding="utf-8") as output, \
+                open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+
+            def record(result: TopicResult) -> None:
+                result.finished_at = datetime.now(timezone.utc).isoformat()
+                output.write(json.dumps(asdict(result)) + "\n")
+                output.flush()
+                self.latencies.append(result.latency)
+                if result.ok:
+                    self.succeeded += 1
+                    checkpoint.write(result.key + "\n")
+                    checkpoint.flush()
+                else:
+                    self.failed += 1
+                self._maybe_report()
+
+            in_flight = set()
+            for topic in pending():
+                if len(in_flight) >= self.concurrency:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+                in_flight.add(pool.submit(self.run_topic, topic))
+            for future in in_flight:
+                record(future.result())
+
+        return self.stats()
+
+    def stats(self) -> Dict:
+        elapsed = time.monotonic() - self._started
+        completed = self.succeeded + self.failed
+        return {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed": round(elapsed, 2),
+            "throughput": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency": summarize(self.latencies),
+        }
+
+    def _maybe_report(self) -> None:
+        now = time.monotonic()
+        if not self.stats_interval or now - self._last_report < self.stats_interval:
+            return
+        self._last_report = now
+        stats = self.stats()
+        latency = stats["latency"]
+        print(
+            f"⏱️  {stats['elapsed']:.0f}s  ✅ {stats['succeeded']}  ❌ {stats['failed']}  "
+            f"⏭️  {stats['skipped']}  {stats['throughput']:.2f} topics/s  "
+            f"p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s",
+            flush=True,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Generate content for a file of topics."""
+    parser = argparse.ArgumentParser(description="Generate poems and jokes for many topics")
+    parser.add_argument("topics", help="CSV, JSONL or text file of topics")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="file of finished topics (default: <output>.checkpoint)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--webhook", default=default_webhook_url(), help="webhook URL (default: N8N_WEBHOOK_URL)")
+    target.add_argument("--workflow-id", help="run this workflow with N8nClient.execute_workflow instead")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="topics in flight at once")
+    parser.add_argument("--rps", type=float, help="cap on requests per second")
+    parser.add_argument("--retries", type=int, default=2, help="retries per topic for 429/5xx/network errors")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    if args.workflow_id:
+        generate = workflow_generator(args.workflow_id)
+        rate_key = f"bulk-generate:workflow:{args.workflow_id}"
+    elif args.webhook:
+        generate = webhook_generator(args.webhook)
+        rate_key = f"bulk-generate:{urlparse(args.webhook).netloc}"
+    else:
+        print("❌ Error: N8N_WEBHOOK_URL (or N8N_API_URL) must be set in .env file, or pass --webhook")
+        return 1
+
+    checkpoint = args.checkpoint or f"{args.output}.checkpoint"
+    runner = BulkRunner(
+        generate,
+        concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        rate_key=rate_key,
+        max_retries=args.retries,
+        stats_interval=args.stats_interval,
+    )
+
+    print("🚀 Bulk generation")
+    print("=" * 50)
+    print(f"📄 Topics:     {args.topics}")
+    print(f"💾 Output:     {args.output}")
+    print(f"📌 Checkpoint: {checkpoint}")
+    try:
+        stats = runner.run(read_topics(args.topics), args.output, checkpoint)
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; rerun the same command to resume")
+        return 130
+
+    latency = stats["latency"]
+    print("=" * 50)
+    print(f"✅ Succeeded: {stats['succeeded']}  ❌ Failed: {stats['failed']}  ⏭️  Skipped: {stats['skipped']}")
+    print(f"⚡ {stats['throughput']:.2f} topics/s over {stats['elapsed']:.1f}s")
+    print(f"⏱️  p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s  p99 {latency['p99']:.2f}s")
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Configuration
+Environment loading shared by every entry point.
+
+Clients call load_env() on import; the .env file is only read the first time,
+however many modules (or CLI subcommands) ask for it.
+"""
+
+import os
+from typing import Optional
+
+_loaded = False
+
+
+def load_env(path: Optional[str] = None) -> None:
+    """Load ``.env`` (or ``path``) into the environment once per process."""
+    global _loaded
+    if _loaded:
+        return
+    # Imported here so processes that never need configuration don't pay for it
+    from dotenv import load_dotenv
+
+    load_dotenv(path)
+    _loaded = True
+
+
+def env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a setting after making sure ``.env`` has been loaded."""
+    load_env()
+    return os.getenv(name, default)
@@ -0,0 +1,244 @@
+"""
+Execution Metrics
+Latency percentiles per workflow and per node from n8n execution history.
+
+Executions are pulled with their run data (``includeData``), newest first,
+until the start of the time window. Each execution contributes its wall-clock
+duration to its workflow and every node run's ``executionTime`` to that node,
+so slow nodes (an OpenAI call versus a Code node) can be told apart from slow
+workflows.
+"""
+
+import argparse
+import json
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from n8n_client import N8nClient
+
+PERCENTILES = (50, 95, 99)
+
+# Executions fetched per page; run data makes each one large
+DEFAULT_PAGE_SIZE = 20
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an n8n ISO 8601 timestamp (``...Z``) into an aware datetime."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile of sorted ``values`` with linear interpolation."""
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize(values: Iterable[float]) -> Dict[str, float]:
+    """Count, mean, max and percentiles (seconds) of a set of durations."""
+    ordered = sorted(values)
+    stats = {"count": len(ordered)}
+    for pct in PERCENTILES:
+        stats[f"p{pct}"] = round(percentile(ordered, pct), 4)
+    stats["max"] = round(ordered[-1], 4) if ordered else 0.0
+    stats["mean"] = round(sum(ordered) / len(ordered), 4) if ordered else 0.0
+    return stats
+
+
+def execution_duration(execution: Dict) -> Optional[float]:
+    """Wall-clock duration of a finished execution in seconds."""
+    started = parse_timestamp(execution.get("startedAt"))
+    stopped = parse_timestamp(execution.get("stoppedAt"))
+    if started is None or stopped is None:
+        return None
+    return max(0.0, (stopped - started).total_seconds())
+
+
+def execution_status(execution: Dict) -> str:
+    """
+    The execution's ``status``, or for APIs that don't report one: "success"
+    if it finished, otherwise "unknown" (still running, waiting or failed).
+    """
+    return execution.get("status") or ("success" if execution.get("finished") else "unknown")
+
+
+def node_timings(execution: Dict) -> Iterator[Tuple[str, float]]:
+    """Yield ``(node name, seconds)`` for every node run recorded in an execution."""
+    run_data = ((execution.get("data") or {}).get("resultData") or {}).get("runData") or {}
+    for node_name, runs in run_data.items():
+        for run in runs or []:
+            execution_time = run.get("executionTime")
+            if execution_time is not None:
+                yield node_name, execution_time / 1000.0
+
+
+def iter_window(executions: Iterable[Dict], since: Optional[datetime]) -> Iterator[Dict]:
+    """
+    Yield executions until one started before ``since``. The API lists
+    newest first, so nothing older needs to be fetched.
+    """
+    for execution in executions:
+        started = parse_timestamp(execution.get("startedAt"))
+        if since is not None and started is not None and started < since:
+            return
+        yield execution
+
+
+def aggregate(executions: Iterable[Dict]) -> Dict[str, Dict]:
+    """Aggregate executions into per-workflow and per-node latency stats."""
+    durations: Dict[str, List[float]] = {}
+    nodes: Dict[str, Dict[str, List[float]]] = {}
+    names: Dict[str, str] = {}
+    statuses: Dict[str, Dict[str, int]] = {}
+
+    for execution in executions:
+        workflow_id = str(execution.get("workflowId"))
+        workflow_name = (execution.get("workflowData") or {}).get("name")
+        if workflow_name:
+            names[workflow_id] = workflow_name
+
+        status = execution_status(execution)
+        counts = statuses.setdefault(workflow_id, {})
+        counts[status] = counts.get(status, 0) + 1
+
+        duration = execution_duration(execution)
+        if duration is not None:
+            durations.setdefault(workflow_id, []).append(duration)
+        per_node = nodes.setdefault(workflow_id, {})
+        for node_name, seconds in node_timings(execution):
+            per_node.setdefault(node_name, []).append(seconds)
+
+    workflows = {}
+    for workflow_id, counts in statuses.items():
+        node_stats = {name: summarize(values) for name, values in nodes.get(workflow_id, {}).items()}
+        workflows[workflow_id] = {
+            "name": names.get(workflow_id, workflow_id),
+            "executions": sum(counts.values()),
+            "statuses": counts,
+            "duration": summarize(durations.get(workflow_id, [])),
+            # Slowest tail first: the nodes worth looking at come out on top
+            "nodes": dict(sorted(node_stats.items(), key=lambda item: item[1]["p95"], reverse=True)),
+        }
+    return workflows
+
+
+def collect_metrics(
+    client: N8nClient,
+    workflow_id: Optional[str] = None,
+    status: Optional[str] = None,
+    hours: Optional[float] = 24.0,
+    max_executions: Optional[int] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Dict:
+    """
+    Pull executions from the last ``hours`` (all history if None) and
+    aggregate them. ``max_executions`` caps how many are read.
+    """
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=hours) if hours else None
+
+    executions = iter_window(
+        client.iter_executions(workflow_id=workflow_id, status=status, include_data=True, limit=page_size),
+        since,
+    )
+    if max_executions is not None:
+        executions = (execution for _, execution in zip(range(max_executions), executions))
+
+    return {
+        "window": {
+            "since": since.isoformat() if since else None,
+            "until": now.isoformat(),
+            "workflow_id": workflow_id,
+            "status": status,
+        },
+        "workflows": aggregate(executions),
+    }
+
+
+def latency_profile(report: Dict, pct: int = 50) -> Dict:
+    """
+    Turn measured node latencies into a workflow_graph latency profile
+    (``{"nodes": {name: seconds}}``). Node names are only unique within a
+    workflow, so this is most useful for a report on a single workflow.
+    """
+    nodes: Dict[str, float] = {}
+    for workflow in report["workflows"].values():
+        for node_name, stats in workflow["nodes"].items():
+            nodes[node_name] = max(nodes.get(node_name, 0.0), stats[f"p{pct}"])
+    return {"nodes": nodes}
+
+
+def _format_stats(stats: Dict[str, float]) -> str:
+    return (
+        f"p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  p99 {stats['p99']:.3f}s  "
+        f"max {stats['max']:.3f}s  (n={stats['count']})"
+    )
+
+
+def format_report(report: Dict) -> str:
+    """Render a metrics report as text."""
+    window = report["window"]
+    lines = [f"📈 Executions since {window['since'] or 'the beginning'}", "=" * 50]
+    if not report["workflows"]:
+        lines.append("No executions in this window.")
+    for workflow_id, workflow in report["workflows"].items():
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(workflow["statuses"].items()))
+        lines.append("")
+        lines.append(f"📋 {workflow['name']} (ID: {workflow_id}) - {workflow['executions']} executions ({statuses})")
+        lines.append(f"   ⏱️  Total   {_format_stats(workflow['duration'])}")
+        for node_name, stats in workflow["nodes"].items():
+            lines.append(f"   • {node_name}: {_format_stats(stats)}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print execution latency percentiles."""
+    parser = argparse.ArgumentParser(description="Per-workflow and per-node latency from n8n executions")
+    parser.add_argument("--workflow", help="only executions of this workflow ID")
+    parser.add_argument("--status", choices=["success", "error", "waiting"], help="only executions with this status")
+    parser.add_argument("--hours", type=float, default=24.0, help="time window in hours (0 for all history)")
+    parser.add_argument("--max-executions", type=int, help="stop after this many executions")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--write-profile", metavar="PATH",
+                        help="write measured p50 node latencies as a workflow_graph profile")
+    args = parser.parse_args(argv)
+
+    try:
+        client = N8nClient()
+    except ValueError as e:
+        print(f"❌ Configuration Error: {e}")
+        return 1
+
+    with client:
+        report = collect_metrics(
+            client,
+            workflow_id=args.workflow,
+            status=args.status,
+            hours=args.hours or None,
+            max_executions=args.max_executions,
+        )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+
+    if args.write_profile:
+        with open(args.write_profile, "w", encoding="utf-8") as f:
+            json.dump(latency_profile(report), f, indent=2)
+        if not args.json:
+            print(f"\n💾 Latency profile written to {args.write_profile}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,7 @@
 Main application entry point for n8n Workflow Manager
 """
 
-from n8n_client import N8nClient
-from airtable_client import AirtableClient
+from status_dashboard import check_status, format_dashboard
 
 
 def main():
@@ -12,31 +11,21 @@ def main():
     print("=" * 50)
     
     try:
-        # Initialize clients
-        print("\n📡 Connecting to n8n API...")
-        n8n = N8nClient()
-        print("✅ n8n API connected successfully!")
-        
-        print("\n📊 Connecting to Airtable API...")
-        airtable = AirtableClient()
-        print("✅ Airtable API connected successfully!")
-        
-        # Get existing workflows
-        print("\n📋 Fetching existing workflows...")
-        workflows = n8n.get_workflows()
-        print(f"✅ Found {len(workflows)} workflow(s)")
-        
-        if workflows:
-            print("\nExisting workflows:")
-            for wf in workflows:
-                status = "🟢 Active" if wf.get("active") else "⚪ Inactive"
-                print(f"  - {wf.get('name')} (ID: {wf.get('id')}) {status}")
+        # Probe n8n and every Airtable base at once; a slow or unreachable
+        # service shows up as a timeout instead of stalling the other checks
+        print("\n📡 Checking n8n and Airtable...")
+        results = check_status()
+        print(format_dashboard(results))
         
         print("\n" + "=" * 50)
-        print("✨ Setup complete! Ready to manage workflows.")
+        if all(result.ok for result in results):
+            print("✨ Setup complete! Ready to manage workflows.")
+        else:
+            print("⚠️  Some checks failed; see above.")
         print("\nNext steps:")
         print("1. Run workflows/crazy_daves_workflow.py to create the demo workflow")
-        print("2. Check the README.md for more usage examples")
+        print("2. List workflows with: python skylin.py list")
+        print("3. Check the README.md for more usage examples")
         
     except ValueError as e:
         print(f"❌ Configuration Error: {e}")
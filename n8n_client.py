@@ -3,91 +3,364 @@ n8n API Client
 Handles all interactions with the n8n API for workflow management.
 """
 
+import copy
 import os
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
 import requests
-from typing import Dict, List, Optional
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from config import load_env
+from rate_limit import compute_backoff, get_breaker, get_bucket, parse_retry_after
+from workflow_cache import WorkflowCache
+
+if TYPE_CHECKING:
+    from workflow_store import WorkflowStore
+
+load_env()
+
+# Connect / read timeout in seconds applied to every request
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Methods that can be replayed after a 5xx or a dropped connection without
+# risking duplicate side effects (a 429 is retried for every method because
+# the server rejected the request before processing it)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+
+# Heavy per-workflow bodies dropped from listings in summary mode
+SUMMARY_EXCLUDED_FIELDS = ("nodes", "connections", "pinData", "staticData")
 
-load_dotenv()
+
+def workflow_list_params(
+    active: Optional[bool] = None,
+    tags: Optional[Union[str, Iterable[str]]] = None,
+    name: Optional[str] = None,
+    limit: int = 100,
+    summary: bool = False,
+) -> Dict:
+    """Build query params for GET /workflows from listing filters."""
+    params = {"limit": limit}
+    if active is not None:
+        params["active"] = "true" if active else "false"
+    if tags:
+        params["tags"] = tags if isinstance(tags, str) else ",".join(tags)
+    if name:
+        params["name"] = name
+    if summary:
+        params["excludePinnedData"] = "true"
+    return params
+
+
+def execution_list_params(
+    workflow_id: Optional[str] = None,
+    status: Optional[str] = None,
+    include_data: bool = False,
+    limit: int = 100,
+) -> Dict:
+    """Build query params for GET /executions from listing filters."""
+    params = {"limit": limit}
+    if workflow_id:
+        params["workflowId"] = workflow_id
+    if status:
+        params["status"] = status
+    if include_data:
+        params["includeData"] = "true"
+    return params
+
+
+def summarize_workflow(workflow: Dict) -> Dict:
+    """Return a workflow listing entry without its node graph and data."""
+    return {key: value for key, value in workflow.items() if key not in SUMMARY_EXCLUDED_FIELDS}
 
 
 class N8nClient:
     """Client for interacting with n8n API."""
-    
-    def __init__(self):
-        self.api_url = os.getenv("N8N_API_URL")
-        self.api_token = os.getenv("N8N_API_TOKEN")
-        
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        pool_maxsize: int = 10,
+        cache: Optional[WorkflowCache] = None,
+        store: Optional["WorkflowStore"] = None,
+        requests_per_second: Optional[float] = None,
+        rate_limit_dir: Optional[str] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        api_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+    ):
+        """
+        Args:
+            timeout: (connect, read) timeout in seconds.
+            max_retries: Retries for 429/5xx responses and dropped connections.
+            pool_maxsize: Keep-alive connections kept per host.
+            cache: Optional WorkflowCache for get_workflow().
+            store: Optional WorkflowStore recording every body get_workflow()
+                downloads as a version.
+            requests_per_second: Request budget for this n8n host, shared by
+                every client in the process (and across processes when
+                ``rate_limit_dir`` or RATE_LIMIT_DIR is set). None disables pacing.
+            failure_threshold / recovery_timeout: After this many consecutive
+                failures calls to the host fail fast with CircuitOpenError for
+                ``recovery_timeout`` seconds.
+            api_url / api_token: Override N8N_API_URL / N8N_API_TOKEN.
+        """
+        self.api_url = api_url or os.getenv("N8N_API_URL")
+        self.api_token = api_token or os.getenv("N8N_API_TOKEN")
+
         if not self.api_url or not self.api_token:
             raise ValueError("N8N_API_URL and N8N_API_TOKEN must be set in .env file")
-        
+
+        self.api_url = self.api_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        # Optional body cache for get_workflow(), revalidated by listings
+        self.cache = cache
+        self.store = store
+
+        # Pacing and circuit breaking are shared per host across clients
+        host_key = f"n8n:{urlparse(self.api_url).netloc}"
+        self.bucket = (
+            get_bucket(host_key, requests_per_second, shared_dir=rate_limit_dir)
+            if requests_per_second else None
+        )
+        self.breaker = get_breaker(host_key, failure_threshold, recovery_timeout)
+
         self.headers = {
             "X-N8N-API-KEY": self.api_token,
             "Content-Type": "application/json"
         }
-    
-    def get_workflows(self) -> List[Dict]:
-        """Get all workflows from n8n."""
-        response = requests.get(
-            f"{self.api_url}/workflows",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json().get("data", [])
-    
+
+        # One keep-alive session per client. The underlying urllib3 pool is
+        # thread-safe, so a single client can be shared by worker threads.
+        # Retries are handled in _request() so they can honour Retry-After.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections and persist the workflow cache, if any."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session, retrying transient failures."""
+        url = f"{self.api_url}{path}"
+        kwargs.setdefault("timeout", self.timeout)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            # Fail fast while the host is unhealthy instead of adding to the load
+            self.breaker.before_call()
+            if self.bucket is not None:
+                self.bucket.acquire()
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.breaker.record_failure()
+                # A connect timeout never reached the server, so it is safe to
+                # resend any request; other network errors only idempotent ones
+                retryable = isinstance(e, requests.exceptions.ConnectTimeout) or (
+                    idempotent
+                    and isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                )
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = compute_backoff(attempt, self.backoff_factor, self.max_backoff)
+            else:
+                status = response.status_code
+                if status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if (
+                    status not in RETRY_STATUSES
+                    or attempt >= self.max_retries
+                    or (status != 429 and not idempotent)
+                ):
+                    return response
+                delay = compute_backoff(
+                    attempt,
+                    self.backoff_factor,
+                    self.max_backoff,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                )
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def iter_workflows(
+        self,
+        active: Optional[bool] = None,
+        tags: Optional[Union[str, Iterable[str]]] = None,
+        name: Optional[str] = None,
+        limit: int = 100,
+        summary: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Iterate over workflows page by page, following ``nextCursor``.
+
+        Filters are applied server-side; ``limit`` is the page size. With
+        ``summary=True`` each workflow is yielded without its nodes,
+        connections and pinned/static data, so memory stays flat no matter
+        how large the instance is.
+
+        When a cache is attached, every listed ``updatedAt`` revalidates (or
+        evicts) the matching cached body.
+        """
+        params = workflow_list_params(active, tags, name, limit, summary)
+        while True:
+            response = self._request("GET", "/workflows", params=params)
+            response.raise_for_status()
+            page = response.json()
+            for workflow in page.get("data", []):
+                if self.cache is not None:
+                    self.cache.observe(workflow)
+                yield summarize_workflow(workflow) if summary else workflow
+
+            cursor = page.get("nextCursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    def get_workflows(self, **filters) -> List[Dict]:
+        """Get all workflows from n8n (accepts the same filters as iter_workflows)."""
+        return list(self.iter_workflows(**filters))
+
+    def revalidate_cache(self) -> None:
+        """Revalidate every cached body with one pass over the summary listing."""
+        if self.cache is None:
+            return
+        seen = [workflow.get("id") for workflow in self.iter_workflows(limit=250, summary=True)]
+        self.cache.retain(seen)
+
     def get_workflow(self, workflow_id: str) -> Dict:
         """Get a specific workflow by ID."""
-        response = requests.get(
-            f"{self.api_url}/workflows/{workflow_id}",
-            headers=self.headers
-        )
+        if self.cache is None:
+            response = self._request("GET", f"/workflows/{workflow_id}")
+            response.raise_for_status()
+            workflow = response.json()
+            if self.store is not None:
+                self.store.record(workflow)
+            return workflow
+
+        cached = self.cache.get(workflow_id)
+        if cached is not None:
+            return cached
+
+        # Stale entry: revalidate with a conditional request when possible
+        entry = self.cache.lookup(workflow_id)
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+        response = self._request("GET", f"/workflows/{workflow_id}", headers=headers)
+        if entry is not None and response.status_code == 304:
+            self.cache.touch(workflow_id)
+            return copy.deepcopy(entry["workflow"])
+        response.raise_for_status()
+        workflow = response.json()
+        self.cache.put(workflow_id, workflow, response.headers.get("ETag"))
+        if self.store is not None:
+            self.store.record(workflow)
+        return workflow
+
+    def iter_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        include_data: bool = False,
+        limit: int = 100,
+    ) -> Iterator[Dict]:
+        """
+        Iterate over executions, newest first, following ``nextCursor``.
+
+        ``status`` is one of ``success``, ``error`` or ``waiting``. With
+        ``include_data=True`` each execution carries its ``data.resultData.runData``
+        (per-node timings and output), which is large; keep ``limit`` (the
+        page size) small in that case.
+        """
+        params = execution_list_params(workflow_id, status, include_data, limit)
+        while True:
+            response = self._request("GET", "/executions", params=params)
+            response.raise_for_status()
+            page = response.json()
+            yield from page.get("data", [])
+
+            cursor = page.get("nextCursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    def get_executions(self, **filters) -> List[Dict]:
+        """Get all executions (accepts the same filters as iter_executions)."""
+        return list(self.iter_executions(**filters))
+
+    def get_execution(self, execution_id: str, include_data: bool = False) -> Dict:
+        """Get a specific execution by ID."""
+        params = {"includeData": "true"} if include_data else None
+        response = self._request("GET", f"/executions/{execution_id}", params=params)
         response.raise_for_status()
         return response.json()
-    
+
     def create_workflow(self, workflow_data: Dict) -> Dict:
         """Create a new workflow in n8n."""
-        response = requests.post(
-            f"{self.api_url}/workflows",
-            headers=self.headers,
-            json=workflow_data
-        )
+        response = self._request("POST", "/workflows", json=workflow_data)
         if response.status_code >= 400:
             print(f"Error Response: {response.text}")
         response.raise_for_status()
         return response.json()
-    
+
     def update_workflow(self, workflow_id: str, workflow_data: Dict) -> Dict:
         """Update an existing workflow."""
-        response = requests.patch(
-            f"{self.api_url}/workflows/{workflow_id}",
-            headers=self.headers,
-            json=workflow_data
-        )
-        response.raise_for_status()
-        return response.json()
-    
+        try:
+            response = self._request("PATCH", f"/workflows/{workflow_id}", json=workflow_data)
+            response.raise_for_status()
+            return response.json()
+        finally:
+            # After the write, so a read racing it can't cache the old body again;
+            # also on failure, since the update may have been applied anyway
+            if self.cache is not None:
+                self.cache.invalidate(workflow_id)
+
     def delete_workflow(self, workflow_id: str) -> None:
         """Delete a workflow."""
-        response = requests.delete(
-            f"{self.api_url}/workflows/{workflow_id}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-    
+        try:
+            response = self._request("DELETE", f"/workflows/{workflow_id}")
+            response.raise_for_status()
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(workflow_id)
+
     def activate_workflow(self, workflow_id: str) -> Dict:
         """Activate a workflow."""
         return self.update_workflow(workflow_id, {"active": True})
-    
+
     def deactivate_workflow(self, workflow_id: str) -> Dict:
         """Deactivate a workflow."""
         return self.update_workflow(workflow_id, {"active": False})
-    
+
     def execute_workflow(self, workflow_id: str, data: Optional[Dict] = None) -> Dict:
         """Execute a workflow."""
-        response = requests.post(
-            f"{self.api_url}/workflows/{workflow_id}/execute",
-            headers=self.headers,
-            json=data or {}
-        )
+        response = self._request("POST", f"/workflows/{workflow_id}/execute", json=data or {})
         response.raise_for_status()
         return response.json()
@@ -0,0 +1,260 @@
+"""
+n8n Instances
+Registry of named n8n instances (dev, staging, production) and promotion
+of workflows between them.
+
+Instances are configured in ``.env``::
+
+    N8N_INSTANCES=dev,staging,production
+    N8N_DEV_API_URL=https://dev.example.com/api/v1
+    N8N_DEV_API_TOKEN=...
+    N8N_STAGING_API_URL=...
+
+The plain N8N_API_URL / N8N_API_TOKEN pair is available as ``default``.
+Each instance gets its own N8nClient, so its own keep-alive pool, rate
+limit bucket and circuit breaker.
+
+Promotion copies workflows by name. Both instances are listed once; a
+workflow whose source and target ``updatedAt`` both match the previous
+promotion is skipped without downloading anything. The rest are fetched
+from the source concurrently and deployed through workflow_sync, which
+compares content hashes and only creates or updates what differs. Node
+credentials and static data are never copied: credentials already attached
+on the target are kept, and new workflows get theirs in the n8n UI, as
+with deploys.
+"""
+
+import argparse
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import load_env
+from n8n_client import N8nClient
+from workflow_sync import PROJECT_DIR, SyncResult, build_index, load_state, save_state, sync_definitions
+
+DEFAULT_STATE_PATH = os.path.join(PROJECT_DIR, ".n8n_promote_state.json")
+
+DEFAULT_INSTANCE = "default"
+
+# Fields of a source workflow that are promoted
+PROMOTED_FIELDS = ("name", "nodes", "connections", "settings")
+
+
+def _env_prefix(name: str) -> str:
+    return "N8N_" + re.sub(r"[^A-Z0-9]+", "_", name.upper()).strip("_")
+
+
+def configured_instances() -> Dict[str, Tuple[str, str]]:
+    """Map instance name -> (API URL, API token) from the environment."""
+    load_env()
+    instances = {}
+    if os.getenv("N8N_API_URL") and os.getenv("N8N_API_TOKEN"):
+        instances[DEFAULT_INSTANCE] = (os.getenv("N8N_API_URL"), os.getenv("N8N_API_TOKEN"))
+
+    for name in (value.strip() for value in (os.getenv("N8N_INSTANCES") or "").split(",")):
+        if not name:
+            continue
+        prefix = _env_prefix(name)
+        url, token = os.getenv(f"{prefix}_API_URL"), os.getenv(f"{prefix}_API_TOKEN")
+        if not url or not token:
+            raise ValueError(f"{prefix}_API_URL and {prefix}_API_TOKEN must be set in .env file")
+        instances[name] = (url, token)
+    return instances
+
+
+def promotable(workflow: Dict) -> Dict:
+    """Source workflow reduced to what is promoted, without node credentials."""
+    definition = {key: workflow[key] for key in PROMOTED_FIELDS if key in workflow}
+    definition["nodes"] = [
+        {key: value for key, value in node.items() if key != "credentials"}
+        for node in workflow.get("nodes", [])
+    ]
+    return definition
+
+
+def _tag_names(workflow: Dict) -> List[str]:
+    return [tag.get("name") if isinstance(tag, dict) else str(tag) for tag in workflow.get("tags") or []]
+
+
+class InstanceRegistry:
+    """Named N8nClients, created on first use and shared afterwards."""
+
+    def __init__(self, instances: Optional[Dict[str, Tuple[str, str]]] = None, **client_options):
+        """
+        Args:
+            instances: name -> (API URL, API token); read from the
+                environment by default.
+            client_options: Passed to every N8nClient (e.g. pool_maxsize).
+        """
+        self.instances = instances if instances is not None else configured_instances()
+        self.client_options = client_options
+        self._clients: Dict[str, N8nClient] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return list(self.instances)
+
+    def get(self, name: str) -> N8nClient:
+        """The client for instance ``name``."""
+        if name not in self.instances:
+            known = ", ".join(self.instances) or "none"
+            raise ValueError(f"Unknown n8n instance '{name}' (configured: {known})")
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                api_url, api_token = self.instances[name]
+                client = self._clients[name] = N8nClient(api_url=api_url, api_token=api_token,
+                                                          **self.client_options)
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def promote(
+    source: N8nClient,
+    target: N8nClient,
+    names: Optional[Iterable[str]] = None,
+    tags: Optional[Iterable[str]] = None,
+    state: Optional[Dict] = None,
+    dry_run: bool = False,
+    max_workers: int = 8,
+) -> List[SyncResult]:
+    """
+    Make the target's workflows match the source's, by name.
+
+    ``names`` / ``tags`` restrict which source workflows are promoted.
+    ``state`` (this source/target pair's section of the state file) lets
+    workflows untouched on both sides since the last promotion be skipped
+    without fetching them; it is updated in place unless ``dry_run``.
+    """
+    state = state if state is not None else {}
+    records = state.setdefault("workflows", {})
+    promoted_from = state.setdefault("source", {})
+    wanted_names = set(names) if names else None
+    wanted_tags = set(tags) if tags else None
+
+    # Both listings at once; neither depends on the other
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        source_future = pool.submit(build_index, source)
+        target_future = pool.submit(build_index, target)
+        source_index, target_index = source_future.result(), target_future.result()
+
+    results: List[SyncResult] = []
+    pending = []
+    for name, summary in sorted(source_index.items()):
+        if wanted_names is not None and name not in wanted_names:
+            continue
+        if wanted_tags is not None and not wanted_tags & set(_tag_names(summary)):
+            continue
+        record, live = records.get(name), target_index.get(name)
+        if (
+            record
+            and live
+            and promoted_from.get(name) == summary.get("updatedAt")
+            and record.get("id") == live.get("id")
+            and record.get("updatedAt") == live.get("updatedAt")
+        ):
+            results.append(SyncResult(name, "skip", live.get("id"), record.get("hash"), live.get("updatedAt")))
+        else:
+            pending.append(summary)
+
+    def fetch(summary: Dict):
+        try:
+            return promotable(source.get_workflow(summary.get("id")))
+        except Exception as e:
+            return SyncResult(summary.get("name"), "error", error=f"fetching from source: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        fetched = list(pool.map(fetch, pending))
+    results.extend(item for item in fetched if isinstance(item, SyncResult))
+    definitions = [item for item in fetched if isinstance(item, dict)]
+
+    synced = sync_definitions(target, definitions, records, dry_run, max_workers, target_index)
+    results.extend(synced)
+
+    if not dry_run:
+        for result in synced:
+            if result.workflow_id and not result.error:
+                promoted_from[result.name] = source_index[result.name].get("updatedAt")
+    return sorted(results, key=lambda result: result.name or "")
+
+
+def print_results(results: List[SyncResult], dry_run: bool) -> int:
+    icons = {"create": "🆕", "update": "✏️ ", "skip": "⏭️ ", "error": "❌"}
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.action] = counts.get(result.action, 0) + 1
+        if result.action != "skip":
+            detail = result.error or result.workflow_id or ""
+            print(f"  {icons.get(result.action, '•')} {result.action:<6} {result.name} {detail}")
+    summary = ", ".join(f"{count} {action}" for action, count in sorted(counts.items()))
+    print(f"\n✨ Done{' (dry run)' if dry_run else ''}: {summary or 'nothing to promote'}")
+    return 1 if counts.get("error") else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """List configured instances or promote workflows between them."""
+    parser = argparse.ArgumentParser(description="Manage several n8n instances")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list configured instances")
+    promote_parser = commands.add_parser("promote", help="promote workflows from one instance to another")
+    promote_parser.add_argument("source", help="instance to copy from (e.g. staging)")
+    promote_parser.add_argument("target", help="instance to copy to (e.g. production)")
+    promote_parser.add_argument("--workflow", action="append", help="only this workflow name (repeatable)")
+    promote_parser.add_argument("--tag", action="append", help="only workflows with this tag (repeatable)")
+    promote_parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="promotion state file")
+    promote_parser.add_argument("--workers", type=int, default=8, help="concurrent API calls per instance")
+    promote_parser.add_argument("--dry-run", action="store_true", help="report changes without applying them")
+    args = parser.parse_args(argv)
+
+    try:
+        instances = configured_instances()
+    except ValueError as e:
+        print(f"❌ Configuration Error: {e}")
+        return 1
+
+    if args.command == "list":
+        print("🌐 n8n instances")
+        print("=" * 50)
+        for name, (api_url, _) in instances.items():
+            print(f"  - {name}: {api_url}")
+        if not instances:
+            print("  (none; set N8N_API_URL or N8N_INSTANCES in .env)")
+        return 0
+
+    if args.source == args.target:
+        print("❌ Error: source and target are the same instance")
+        return 1
+
+    print(f"\n🚚 Promoting workflows: {args.source} → {args.target}")
+    print("=" * 50)
+    with InstanceRegistry(instances, pool_maxsize=args.workers) as registry:
+        try:
+            source, target = registry.get(args.source), registry.get(args.target)
+        except ValueError as e:
+            print(f"❌ Configuration Error: {e}")
+            return 1
+        state = load_state(args.state)
+        pair_state = state.setdefault(f"{source.api_url} -> {target.api_url}", {})
+        results = promote(source, target, args.workflow, args.tag, pair_state, args.dry_run, args.workers)
+        if not args.dry_run:
+            save_state(args.state, state)
+    return print_results(results, args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
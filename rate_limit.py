@@ -0,0 +1,271 @@
+"""
+Rate Limiting
+Client-side request pacing and circuit breaking shared by the API clients.
+
+Token buckets are keyed per upstream (n8n host, Airtable base) and shared by
+every client in the process; with a shared directory they are also shared
+across processes through a lock file. Circuit breakers make callers fail
+fast while an upstream keeps erroring instead of piling on retries.
+"""
+
+import os
+import random
+import re
+import struct
+import threading
+import time
+import warnings
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets can't be shared across processes
+    fcntl = None
+
+# Directory for cross-process bucket files; unset keeps buckets in-process
+RATE_LIMIT_DIR_ENV = "RATE_LIMIT_DIR"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def compute_backoff(attempt: int, backoff_factor: float, max_backoff: float,
+                    retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based).
+
+    Uses exponential backoff with full jitter. A server supplied Retry-After
+    takes precedence, with a little jitter on top so parallel callers that were
+    throttled together don't all come back at the same instant.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, backoff_factor)
+    return random.uniform(0, min(max_backoff, backoff_factor * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take ``tokens`` if available. Returns 0 on success, otherwise the
+        number of seconds until they will be.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are taken. Returns False if ``timeout`` expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a small file guarded by an exclusive
+    ``flock``, so every process on the host draws from the same budget.
+    """
+
+    _STATE = struct.Struct("dd")  # tokens, wall-clock time of last refill
+
+    def __init__(self, path: str, rate: float, capacity: Optional[float] = None):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl (not available on this platform)")
+        super().__init__(rate, capacity)
+        self.path = path
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        with self._lock, open(self.path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                data = f.read(self._STATE.size)
+                now = time.time()
+                if len(data) == self._STATE.size:
+                    stored, updated = self._STATE.unpack(data)
+                    available = min(self.capacity, stored + max(0.0, now - updated) * self.rate)
+                else:
+                    available = self.capacity
+
+                if available >= tokens:
+                    available -= tokens
+                    wait = 0.0
+                else:
+                    wait = (tokens - available) / self.rate
+
+                f.seek(0)
+                f.truncate()
+                f.write(self._STATE.pack(available, now))
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"Circuit for {name} is open; retry in {retry_in:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail immediately with CircuitOpenError. Once ``recovery_timeout`` seconds
+    have passed a single trial call is let through (half-open): success closes
+    the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str = "upstream", failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            # A trial that never reported back (e.g. a cancelled call) is
+            # given up on after another recovery_timeout
+            now = time.monotonic()
+            if state == self.HALF_OPEN and (
+                not self._trial_in_flight or now - self._trial_started >= self.recovery_timeout
+            ):
+                self._trial_in_flight = True
+                self._trial_started = now
+                return
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_bucket(key: str, rate: float, capacity: Optional[float] = None,
+               shared_dir: Optional[str] = None) -> TokenBucket:
+    """
+    Return the bucket for ``key`` (e.g. ``"airtable:appXXX"``), creating it
+    on first use. Every caller pacing the same upstream shares it, so the
+    first caller's ``rate`` and ``capacity`` win; a later caller asking for
+    different ones gets a warning and the existing bucket.
+
+    If ``shared_dir`` (or the RATE_LIMIT_DIR environment variable) is set and
+    the platform supports file locks, the bucket is also shared with other
+    processes using the same directory.
+    """
+    shared_dir = shared_dir or os.getenv(RATE_LIMIT_DIR_ENV)
+    with _registry_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            if shared_dir and fcntl is not None:
+                os.makedirs(shared_dir, exist_ok=True)
+                filename = re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".bucket"
+                bucket = FileTokenBucket(os.path.join(shared_dir, filename), rate, capacity)
+            else:
+                bucket = TokenBucket(rate, capacity)
+            _buckets[key] = bucket
+        elif bucket.rate != rate or (capacity is not None and bucket.capacity != capacity):
+            warnings.warn(
+                f"Rate limit bucket '{key}' already exists at {bucket.rate}/s (capacity {bucket.capacity}); "
+                f"ignoring {rate}/s (capacity {capacity if capacity is not None else rate})",
+                stacklevel=2,
+            )
+        return bucket
+
+
+def get_breaker(key: str, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for ``key``, creating it on first use."""
+    with _registry_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(key, failure_threshold, recovery_timeout)
+        return breaker
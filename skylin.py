@@ -0,0 +1,281 @@
+"""
+Skylin CLI
+Single entry point for the workflow manager's tools.
+
+Subcommands import what they need when they run, so listing workflows never
+loads pyairtable and ``skylin --help`` loads neither client. ``--profile``
+reports how long those imports took and a cProfile breakdown of the command.
+
+    python skylin.py status
+    python skylin.py list --active
+    python skylin.py deploy --dry-run
+    python skylin.py --profile list
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Seconds spent importing each module loaded through _lazy()
+_IMPORT_TIMES: Dict[str, float] = {}
+
+
+def _lazy(name: str):
+    """Import a module on demand, recording how long the first import took."""
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    _IMPORT_TIMES[name] = time.perf_counter() - started
+    return module
+
+
+class ConfigurationError(Exception):
+    """A client couldn't be created from the environment (e.g. missing credentials)."""
+
+
+def _n8n(**kwargs):
+    try:
+        return _lazy("n8n_client").N8nClient(**kwargs)
+    except ValueError as e:
+        raise ConfigurationError(e) from e
+
+
+def _airtable():
+    try:
+        return _lazy("airtable_client").AirtableClient()
+    except ValueError as e:
+        raise ConfigurationError(e) from e
+
+
+def _print_json(data) -> None:
+    print(json.dumps(data, indent=2, default=str))
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    active = True if args.active else False if args.inactive else None
+    with _n8n() as n8n:
+        workflows = n8n.iter_workflows(active=active, tags=args.tag, name=args.name, summary=True)
+        if args.json:
+            _print_json(list(workflows))
+            return 0
+        count = 0
+        for wf in workflows:
+            count += 1
+            status = "🟢 Active" if wf.get("active") else "⚪ Inactive"
+            print(f"  - {wf.get('name')} (ID: {wf.get('id')}) {status}")
+    print(f"✅ Found {count} workflow(s)")
+    return 0
+
+
+def _resolve_definition(name: str) -> str:
+    """Path of a workflow definition given as a path or a module name in workflows/."""
+    if os.path.exists(name):
+        return name
+    workflow_sync = _lazy("workflow_sync")
+    path = os.path.join(workflow_sync.DEFAULT_WORKFLOWS_DIR, name if name.endswith(".py") else f"{name}.py")
+    if not os.path.exists(path):
+        raise ValueError(f"No workflow definition '{name}' (looked for {path})")
+    return path
+
+
+def cmd_create(args: argparse.Namespace) -> int:
+    workflow_sync = _lazy("workflow_sync")
+    definition = workflow_sync.load_definition(_resolve_definition(args.definition))
+    if definition is None:
+        raise ValueError(f"{args.definition} has no build_workflow() function")
+    with _n8n() as n8n:
+        result = n8n.create_workflow(workflow_sync.deployable_payload(definition))
+    print(f"✅ Created '{result.get('name')}' (ID: {result.get('id')}, {len(result.get('nodes', []))} nodes)")
+    return 0
+
+
+def cmd_execute(args: argparse.Namespace) -> int:
+    try:
+        data = json.loads(args.data) if args.data else None
+    except ValueError as e:
+        raise ValueError(f"--data is not valid JSON: {e}") from e
+    with _n8n() as n8n:
+        _print_json(n8n.execute_workflow(args.workflow_id, data))
+    return 0
+
+
+def cmd_activate(args: argparse.Namespace) -> int:
+    with _n8n() as n8n:
+        for workflow_id in args.workflow_ids:
+            if args.off:
+                n8n.deactivate_workflow(workflow_id)
+                print(f"⚪ Deactivated {workflow_id}")
+            else:
+                n8n.activate_workflow(workflow_id)
+                print(f"🟢 Activated {workflow_id}")
+    return 0
+
+
+def cmd_airtable(args: argparse.Namespace) -> int:
+    client = _airtable()
+    if args.base:
+        client.set_base(args.base)
+
+    if args.action == "tables":
+        tables = client.get_schema().tables
+        if args.json:
+            _print_json([{"id": t.id, "name": t.name, "fields": [f.name for f in t.fields]} for t in tables])
+        else:
+            for table in tables:
+                print(f"  - {table.name} (ID: {table.id}, {len(table.fields)} fields)")
+        return 0
+
+    if not args.table:
+        raise ValueError("records needs a table name")
+    records = client.iter_records(args.table, fields=args.field or None, formula=args.formula,
+                                  view=args.view, max_records=args.limit)
+    for record in records:
+        # One JSON object per line so output can be piped and streamed
+        print(json.dumps(record, default=str))
+    return 0
+
+
+def _delegate(module: str) -> Callable[[argparse.Namespace], int]:
+    """Handler running another tool's ``main(argv)`` with the remaining arguments."""
+    def run(args: argparse.Namespace) -> int:
+        return _lazy(module).main(args.args) or 0
+    return run
+
+
+# Subcommands that forward their arguments to an existing tool: name -> (module, help)
+DELEGATED_COMMANDS = {
+    "status": ("status_dashboard", "check n8n and Airtable concurrently"),
+    "deploy": ("workflow_sync", "deploy workflows/ definitions idempotently"),
+    "export": ("workflow_export", "export live workflows to a git-friendly directory"),
+    "instances": ("n8n_instances", "list n8n instances and promote workflows between them"),
+    "history": ("workflow_store", "workflow version history: snapshot, log, show, diff"),
+    "analyze": ("workflow_graph", "estimate workflow latency from node graphs"),
+    "metrics": ("execution_metrics", "latency percentiles from execution history"),
+    "proxy": ("webhook_proxy", "run the caching webhook proxy"),
+    "bulk": ("bulk_generate", "generate content for a file of topics"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="skylin", description="n8n Workflow Manager with Airtable Integration")
+    parser.add_argument("--profile", action="store_true",
+                        help="report import times and a cProfile breakdown of the command (on stderr)")
+    parser.add_argument("--profile-limit", type=int, default=25, help="functions listed by --profile")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    listing = commands.add_parser("list", help="list workflows")
+    state = listing.add_mutually_exclusive_group()
+    state.add_argument("--active", action="store_true", help="only active workflows")
+    state.add_argument("--inactive", action="store_true", help="only inactive workflows")
+    listing.add_argument("--tag", action="append", help="only workflows with this tag (repeatable)")
+    listing.add_argument("--name", help="only workflows with this name")
+    listing.add_argument("--json", action="store_true", help="print JSON")
+    listing.set_defaults(handler=cmd_list)
+
+    create = commands.add_parser("create", help="create a workflow from a workflows/ definition")
+    create.add_argument("definition", help="module name in workflows/ (e.g. webhook_poem_joke) or a path")
+    create.set_defaults(handler=cmd_create)
+
+    execute = commands.add_parser("execute", help="execute a workflow")
+    execute.add_argument("workflow_id")
+    execute.add_argument("--data", help="JSON input data")
+    execute.set_defaults(handler=cmd_execute)
+
+    activate = commands.add_parser("activate", help="activate (or with --off deactivate) workflows")
+    activate.add_argument("workflow_ids", nargs="+", metavar="workflow_id")
+    activate.add_argument("--off", action="store_true", help="deactivate instead")
+    activate.set_defaults(handler=cmd_activate)
+
+    airtable = commands.add_parser("airtable", help="inspect Airtable tables and records")
+    airtable.add_argument("action", choices=["tables", "records"])
+    airtable.add_argument("table", nargs="?", help="table name or ID (records)")
+    airtable.add_argument("--base", help="base ID (default: AIRTABLE_BASE_ID)")
+    airtable.add_argument("--field", action="append", help="only return this field (repeatable)")
+    airtable.add_argument("--formula", help="filterByFormula")
+    airtable.add_argument("--view", help="view name or ID")
+    airtable.add_argument("--limit", type=int, help="maximum records")
+    airtable.add_argument("--json", action="store_true", help="print JSON (tables)")
+    airtable.set_defaults(handler=cmd_airtable)
+
+    for name, (module, description) in DELEGATED_COMMANDS.items():
+        delegated = commands.add_parser(name, help=description, add_help=False,
+                                        description=f"{description}; run '{name} --help' for options")
+        delegated.add_argument("args", nargs=argparse.REMAINDER)
+        delegated.set_defaults(handler=_delegate(module))
+
+    return parser
+
+
+def _run_profiled(handler: Callable[[argparse.Namespace], int], args: argparse.Namespace) -> int:
+    import cProfile
+    import io
+    import pstats
+
+    modules_before = len(sys.modules)
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        return profiler.runcall(handler, args)
+    finally:
+        elapsed = time.perf_counter() - started
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(args.profile_limit)
+
+        print("\n🔬 Profile", file=sys.stderr)
+        print("=" * 50, file=sys.stderr)
+        print(f"⏱️  Command: {elapsed * 1000:.1f}ms", file=sys.stderr)
+        print(f"📦 Modules loaded by the command: {len(sys.modules) - modules_before}", file=sys.stderr)
+        # Measured under the profiler, which inflates them; compare runs with each other
+        for name, seconds in sorted(_IMPORT_TIMES.items(), key=lambda item: item[1], reverse=True):
+            print(f"   import {name}: {seconds * 1000:.1f}ms", file=sys.stderr)
+        print(out.getvalue(), file=sys.stderr)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse global options and the subcommand. Everything after a delegated
+    subcommand is passed through untouched, options included, which
+    argparse.REMAINDER alone doesn't do reliably.
+    """
+    parser = build_parser()
+    index = 0
+    while index < len(argv) and argv[index].startswith("-"):
+        index += 2 if argv[index] == "--profile-limit" else 1
+    if index < len(argv) and argv[index] in DELEGATED_COMMANDS:
+        args = parser.parse_args(argv[:index + 1])
+        args.args = argv[index + 1:]
+        return args
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse the command line and run the chosen subcommand."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+
+    try:
+        if args.profile:
+            return _run_profiled(args.handler, args)
+        return args.handler(args)
+    except ConfigurationError as e:
+        print(f"❌ Configuration Error: {e}")
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
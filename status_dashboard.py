@@ -0,0 +1,274 @@
+"""
+Status Dashboard
+Concurrent health check of n8n and every configured Airtable base.
+
+Each probe runs on its own thread under a deadline, so the dashboard renders
+as soon as every probe has answered or the deadline has passed, whichever
+comes first; a slow or unreachable upstream shows up as a timeout instead of
+holding up the rest. Probes fill in their details as they go, so a probe cut
+off by the deadline still reports what it had (e.g. workflows counted so far).
+
+Probes:
+
+- n8n workflows: total, active and inactive counts (summary listing)
+- n8n executions: failure rate over the recent window
+- one per Airtable base (AIRTABLE_BASE_ID plus AIRTABLE_BASE_IDS, comma
+  separated): table count from the metadata API
+
+Airtable is probed with a plain metadata request rather than AirtableClient,
+which keeps pyairtable (~300ms to import) off the startup path.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from config import load_env
+from execution_metrics import execution_status, iter_window
+from n8n_client import N8nClient
+from rate_limit import CircuitOpenError, get_breaker
+
+# Seconds each probe gets before it is reported as timed out
+DEFAULT_DEADLINE = 0.75
+
+# Recent executions considered for the failure rate
+DEFAULT_WINDOW_HOURS = 24
+DEFAULT_EXECUTION_SAMPLE = 250
+
+AIRTABLE_API_URL = "https://api.airtable.com"
+
+# Execution statuses counted as failures, and ones that haven't finished yet
+# ("unknown": no status reported and not finished, so possibly still running)
+FAILED_STATUSES = frozenset({"error", "crashed"})
+UNFINISHED_STATUSES = frozenset({"new", "running", "waiting", "unknown"})
+
+# A probe fills in ``details`` as it learns things and raises on failure
+Probe = Callable[[Dict], None]
+
+
+@dataclass
+class ProbeResult:
+    name: str
+    ok: bool
+    seconds: float
+    details: Dict = field(default_factory=dict)
+    error: Optional[str] = None
+    timed_out: bool = False
+
+
+def configured_base_ids() -> List[str]:
+    """AIRTABLE_BASE_ID followed by any extra bases in AIRTABLE_BASE_IDS, deduplicated."""
+    load_env()
+    raw = [os.getenv("AIRTABLE_BASE_ID") or ""] + (os.getenv("AIRTABLE_BASE_IDS") or "").split(",")
+    base_ids: List[str] = []
+    for base_id in (value.strip() for value in raw):
+        if base_id and base_id not in base_ids:
+            base_ids.append(base_id)
+    return base_ids
+
+
+def run_probes(probes: Dict[str, Probe], deadline: float) -> List[ProbeResult]:
+    """
+    Run every probe concurrently and wait at most ``deadline`` seconds.
+
+    Probes run on daemon threads, so one stuck past the deadline is abandoned
+    rather than joined and never delays the caller (or interpreter exit).
+    """
+    started = time.monotonic()
+    finished: Dict[str, ProbeResult] = {}
+    details: Dict[str, Dict] = {name: {} for name in probes}
+    lock = threading.Lock()
+    all_done = threading.Event()
+
+    def run(name: str, probe: Probe) -> None:
+        probe_started = time.monotonic()
+        try:
+            probe(details[name])
+            result = ProbeResult(name, True, time.monotonic() - probe_started, details[name])
+        except Exception as e:
+            result = ProbeResult(name, False, time.monotonic() - probe_started, details[name], error=_describe(e))
+        with lock:
+            finished[name] = result
+            if len(finished) == len(probes):
+                all_done.set()
+
+    for name, probe in probes.items():
+        threading.Thread(target=run, args=(name, probe), name=f"probe:{name}", daemon=True).start()
+    if probes:
+        all_done.wait(deadline)
+
+    elapsed = time.monotonic() - started
+    with lock:
+        return [
+            finished.get(name) or ProbeResult(
+                name, False, elapsed, dict(details[name]), error=f"no answer within {deadline:.2f}s", timed_out=True,
+            )
+            for name in probes
+        ]
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, CircuitOpenError):
+        return f"circuit open (retry in {error.retry_in:.0f}s)"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"HTTP {error.response.status_code}"
+    if isinstance(error, requests.Timeout):
+        return "timed out"
+    if isinstance(error, requests.ConnectionError):
+        return "connection failed"
+    return str(error) or type(error).__name__
+
+
+def n8n_workflow_probe(client: N8nClient) -> Probe:
+    """Count workflows, split into active and inactive."""
+    def probe(details: Dict) -> None:
+        details.update(workflows=0, active=0, inactive=0)
+        for workflow in client.iter_workflows(summary=True):
+            details["workflows"] += 1
+            details["active" if workflow.get("active") else "inactive"] += 1
+    return probe
+
+
+def n8n_execution_probe(client: N8nClient, hours: float = DEFAULT_WINDOW_HOURS,
+                        sample: int = DEFAULT_EXECUTION_SAMPLE) -> Probe:
+    """Failure rate of the most recent ``sample`` executions within the last ``hours``."""
+    def probe(details: Dict) -> None:
+        details.update(executions=0, failed=0, unfinished=0, failure_rate=None)
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        # One page of up to ``sample`` executions is enough for a rate
+        for execution in iter_window(client.iter_executions(limit=sample), since):
+            status = execution_status(execution)
+            if status in UNFINISHED_STATUSES:
+                details["unfinished"] += 1
+                continue
+            details["executions"] += 1
+            if status in FAILED_STATUSES:
+                details["failed"] += 1
+            details["failure_rate"] = round(details["failed"] / details["executions"], 4)
+            if details["executions"] + details["unfinished"] >= sample:
+                break
+    return probe
+
+
+def airtable_base_probe(base_id: str, api_token: str, timeout: float,
+                        api_url: str = AIRTABLE_API_URL) -> Probe:
+    """Fetch the base's table list, through the same breaker as AirtableClient."""
+    def probe(details: Dict) -> None:
+        # Share AirtableClient's per-base breaker so a base it has given up on
+        # is reported immediately instead of being hit again
+        breaker = get_breaker(f"airtable:{base_id}")
+        breaker.before_call()
+        try:
+            response = requests.get(
+                f"{api_url.rstrip('/')}/v0/meta/bases/{base_id}/tables",
+                headers={"Authorization": f"Bearer {api_token}"},
+                timeout=timeout,
+            )
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        response.raise_for_status()
+        details["tables"] = len(response.json().get("tables", []))
+    return probe
+
+
+def build_probes(deadline: float = DEFAULT_DEADLINE, hours: float = DEFAULT_WINDOW_HOURS,
+                 n8n: Optional[N8nClient] = None, airtable_url: str = AIRTABLE_API_URL) -> Dict[str, Probe]:
+    """
+    Probes for everything configured in the environment. Clients get request
+    timeouts matching the deadline and no retries, so abandoned probe threads
+    finish soon after the dashboard renders.
+    """
+    load_env()
+    probes: Dict[str, Probe] = {}
+
+    if n8n is None and os.getenv("N8N_API_URL") and os.getenv("N8N_API_TOKEN"):
+        n8n = N8nClient(timeout=(deadline, deadline), max_retries=0)
+    if n8n is not None:
+        probes["n8n workflows"] = n8n_workflow_probe(n8n)
+        probes["n8n executions"] = n8n_execution_probe(n8n, hours)
+
+    api_token = os.getenv("AIRTABLE_API_TOKEN")
+    if api_token:
+        for base_id in configured_base_ids():
+            probes[f"airtable {base_id}"] = airtable_base_probe(base_id, api_token, deadline, airtable_url)
+
+    if not probes:
+        raise ValueError("Nothing to check: set N8N_API_URL / N8N_API_TOKEN and/or AIRTABLE_API_TOKEN in .env file")
+    return probes
+
+
+def _summary(result: ProbeResult) -> str:
+    details = result.details
+    if "workflows" in details:
+        return f"{details['workflows']} workflow(s): {details['active']} active, {details['inactive']} inactive"
+    if "executions" in details:
+        if not details["executions"]:
+            return "no finished executions in the window"
+        return (f"{details['failed']}/{details['executions']} failed ({details['failure_rate']:.1%})"
+                + (f", {details['unfinished']} running" if details["unfinished"] else ""))
+    if "tables" in details:
+        return f"{details['tables']} table(s)"
+    return ""
+
+
+def format_dashboard(results: List[ProbeResult]) -> str:
+    lines = []
+    for result in results:
+        if result.ok:
+            marker, text = "🟢", _summary(result)
+        else:
+            marker = "🟡" if result.timed_out else "🔴"
+            partial = _summary(result) if result.timed_out else ""
+            text = result.error + (f" (so far: {partial})" if partial else "")
+        lines.append(f"{marker} {result.name:<28} {result.seconds * 1000:>6.0f}ms  {text}")
+    return "\n".join(lines)
+
+
+def check_status(deadline: float = DEFAULT_DEADLINE, hours: float = DEFAULT_WINDOW_HOURS) -> List[ProbeResult]:
+    """Probe everything configured and return the results, in a stable order."""
+    probes = build_probes(deadline, hours)
+    return run_probes(probes, deadline)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the status dashboard; exit 1 if any probe failed."""
+    parser = argparse.ArgumentParser(description="Check n8n and Airtable concurrently")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE,
+                        help=f"seconds each probe may take (default: {DEFAULT_DEADLINE})")
+    parser.add_argument("--hours", type=float, default=DEFAULT_WINDOW_HOURS,
+                        help=f"execution window for the failure rate (default: {DEFAULT_WINDOW_HOURS})")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    try:
+        results = check_status(args.deadline, args.hours)
+    except ValueError as e:
+        print(f"❌ Configuration Error: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))
+    else:
+        print("🩺 Status")
+        print("=" * 50)
+        print(format_dashboard(results))
+        print(f"\n⏱️  Checked in {(time.monotonic() - started) * 1000:.0f}ms")
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
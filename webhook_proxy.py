@@ -0,0 +1,546 @@
+"""
+Webhook Proxy
+Local caching front for the poem & joke generator webhook.
+
+The frontend posts ``{"topic": ...}`` here instead of to n8n. Topics are
+normalized (case, surrounding and repeated whitespace) and answered from a
+TTL-bounded LRU cache; only misses reach the webhook, where each request
+costs an n8n execution and two OpenAI calls. A SQLite tier can keep answers
+across restarts. Concurrent misses for the same topic are coalesced into a
+single webhook call whose answer (or error) is shared by every waiter.
+``GET /stats`` reports hit/miss and coalescing counts.
+
+``GET /stream?topic=...`` answers with Server-Sent Events instead. With
+``--stream-parts`` the poem and the joke are requested in parallel from the
+single-part webhook (``workflows/webhook_poem_joke_part.py``) and each is
+pushed to the browser as soon as it is ready; otherwise both are sent once
+the combined webhook answers.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from config import load_env
+
+load_env()
+
+WEBHOOK_PATH = "poem-joke-generator"
+PART_WEBHOOK_PATH = "poem-joke-part"
+
+# Pieces the single-part webhook can generate, streamed as separate events
+PARTS = ("poem", "joke")
+
+# Topic the workflow falls back to when none is given
+DEFAULT_TOPIC = "AI and creativity"
+
+# Connect / read timeout for the webhook; both OpenAI calls happen inside it
+UPSTREAM_TIMEOUT = (5.0, 120.0)
+
+DEFAULT_CACHE_PATH = ".webhook_cache.db"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _clean_topic(topic: Optional[str]) -> str:
+    """Topic as sent upstream: whitespace tidied, case kept."""
+    return _WHITESPACE.sub(" ", topic or "").strip() or DEFAULT_TOPIC
+
+
+def normalize_topic(topic: Optional[str]) -> str:
+    """Cache key for a topic: trimmed, whitespace collapsed, case-folded."""
+    return _clean_topic(topic).casefold()
+
+
+def default_webhook_url(env_var: str = "N8N_WEBHOOK_URL", path: str = WEBHOOK_PATH) -> Optional[str]:
+    """
+    A production webhook URL: ``env_var`` if set, otherwise ``path`` on the
+    host of N8N_API_URL.
+    """
+    url = os.getenv(env_var)
+    if url:
+        return url
+    api_url = os.getenv("N8N_API_URL")
+    if not api_url:
+        return None
+    parsed = urlparse(api_url)
+    return f"{parsed.scheme}://{parsed.netloc}/webhook/{path}"
+
+
+class ResponseCache:
+    """
+    LRU cache of webhook responses with a TTL, held in memory and optionally
+    in a SQLite file as a second, larger tier.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Least recently used entries beyond this are evicted
+                from memory (they stay in the SQLite tier until they expire).
+            ttl: Seconds an answer is served for.
+            path: SQLite file for the disk tier. None keeps the cache in memory.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, body TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - ttl,))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response for ``key`` if it hasn't expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, body = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                del self._entries[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT body, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    body = json.loads(row[0])
+                    self._remember(key, row[1], body)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return body
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, body: Dict) -> None:
+        """Store a response."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, body)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, body, stored_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(body), now),
+                    )
+
+    def _remember(self, key: str, stored_at: float, body: Dict) -> None:
+        self._entries[key] = (stored_at, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class UpstreamError(Exception):
+    """The webhook failed or returned an unusable response."""
+
+    def __init__(self, message: str, status: int = 502):
+        self.status = status
+        super().__init__(message)
+
+
+class _Flight:
+    """A call in progress and the outcome its waiters will share."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs the function, later callers wait for and share its result or error.
+    """
+
+    def __init__(self, wait_timeout: Optional[float] = None):
+        """
+        Args:
+            wait_timeout: Seconds a waiter waits for the shared call before
+                giving up with a 504 UpstreamError. None waits as long as the
+                call takes (it is bounded by the upstream timeout anyway).
+        """
+        self.wait_timeout = wait_timeout
+        self.calls = 0
+        self.coalesced = 0
+        self.wait_timeouts = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """Return ``(result, shared)``; ``shared`` is True if another caller ran ``fn``."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        elif not flight.done.wait(self.wait_timeout):
+            with self._lock:
+                self.wait_timeouts += 1
+            raise UpstreamError("Timed out waiting for an identical in-flight request", 504)
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result, not leader
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "waiting": sum(flight.waiters for flight in self._flights.values()),
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "wait_timeouts": self.wait_timeouts,
+            }
+
+
+class WebhookProxy:
+    """Answers topics from the cache, calling the webhook once per topic on a miss."""
+
+    def __init__(self, webhook_url: str, cache: Optional[ResponseCache] = None,
+                 timeout: Tuple[float, float] = UPSTREAM_TIMEOUT, wait_timeout: Optional[float] = None,
+                 part_url: Optional[str] = None, max_workers: int = 16):
+        """
+        Args:
+            webhook_url: Webhook answering with the poem and joke together.
+            part_url: Webhook answering with one part; enables streaming of
+                the parts as they finish. Without it streams send both parts
+                at once.
+            wait_timeout: See SingleFlight.
+            max_workers: Threads calling the part webhook for streams.
+        """
+        if not webhook_url:
+            raise ValueError("N8N_WEBHOOK_URL (or N8N_API_URL) must be set in .env file")
+        self.webhook_url = webhook_url
+        self.part_url = part_url
+        self.cache = cache or ResponseCache()
+        self.timeout = timeout
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.session = requests.Session()
+        self.flight = SingleFlight(wait_timeout)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self.session.close()
+        self.cache.close()
+
+    def generate(self, topic: Optional[str]) -> Tuple[Dict, str]:
+        """
+        Return ``(response, source)`` for a topic, where source is ``HIT``
+        (cache), ``MISS`` (this request called the webhook) or ``COALESCED``
+        (shared the answer of an identical request already in flight).
+        """
+        key = normalize_topic(topic)
+        body = self.cache.get(key)
+        if body is not None:
+            return body, "HIT"
+
+        def fetch() -> Dict:
+            fetched = self._call_upstream(self.webhook_url, {"topic": _clean_topic(topic)})
+            # Cached before the flight ends so no request slips in between
+            # and calls the webhook again
+            self.cache.put(key, fetched)
+            return fetched
+
+        body, shared = self.flight.do(key, fetch)
+        return body, "COALESCED" if shared else "MISS"
+
+    def generate_part(self, topic: Optional[str], part: str) -> Tuple[Dict, str]:
+        """Like generate(), for one part from the single-part webhook."""
+        key = f"{part}:{normalize_topic(topic)}"
+        body = self.cache.get(key)
+        if body is not None:
+            return body, "HIT"
+
+        def fetch() -> Dict:
+            fetched = self._call_upstream(self.part_url, {"topic": _clean_topic(topic), "part": part})
+            self.cache.put(key, fetched)
+            return fetched
+
+        body, shared = self.flight.do(key, fetch)
+        return body, "COALESCED" if shared else "MISS"
+
+    def stream(self, topic: Optional[str]) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield ``(event, data)`` pairs: one event per part as soon as it is
+        ready (``part-error`` if it failed), then ``done``.
+        """
+        key = normalize_topic(topic)
+        full = self.cache.get(key)
+        if full is not None or not self.part_url:
+            try:
+                if full is not None:
+                    source = "HIT"
+                else:
+                    full, source = self.generate(topic)
+            except UpstreamError as e:
+                for part in PARTS:
+                    yield "part-error", {"part": part, "error": str(e)}
+            else:
+                for part in PARTS:
+                    yield part, {"part": part, "text": full.get(part), "source": source}
+            yield "done", {"topic": _clean_topic(topic)}
+            return
+
+        futures = {self._pool.submit(self.generate_part, topic, part): part for part in PARTS}
+        texts = {}
+        for future in as_completed(futures):
+            part = futures[future]
+            try:
+                body, source = future.result()
+            except UpstreamError as e:
+                yield "part-error", {"part": part, "error": str(e)}
+                continue
+            texts[part] = body.get("text")
+            yield part, {"part": part, "text": texts[part], "source": source}
+
+        if len(texts) == len(PARTS):
+            # Complete answers also serve the non-streaming endpoint
+            self.cache.put(key, {"success": True, "topic": _clean_topic(topic), **texts})
+        yield "done", {"topic": _clean_topic(topic)}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _call_upstream(self, url: str, payload: Dict) -> Dict:
+        self._count("upstream_calls")
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+        except requests.Timeout as e:
+            self._count("upstream_errors")
+            raise UpstreamError(f"Webhook timed out: {e}", 504) from e
+        except (requests.RequestException, ValueError) as e:
+            self._count("upstream_errors")
+            raise UpstreamError(f"Webhook request failed: {e}") from e
+
+        # Only complete answers are worth caching
+        if not isinstance(body, dict) or not body.get("success"):
+            self._count("upstream_errors")
+            raise UpstreamError("Webhook did not return a successful result")
+        return body
+
+    def stats(self) -> Dict:
+        return {
+            "cache": self.cache.stats(),
+            "coalescing": self.flight.stats(),
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+        }
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front: ``POST /`` (or ``/webhook/poem-joke-generator``),
+    ``GET /stream?topic=...`` and ``GET /stats``.
+    """
+
+    server_version = "SkylinWebhookProxy/1.0"
+    # Headers and body go out in separate writes; without this Nagle's
+    # algorithm holds the body back for a delayed ACK (~40ms per response)
+    disable_nagle_algorithm = True
+    proxy: WebhookProxy
+
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_topic(self) -> Optional[str]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            data = json.loads(raw or b"{}")
+        except ValueError:
+            return None
+        return data.get("topic") if isinstance(data, dict) else None
+
+    def do_OPTIONS(self):
+        # CORS preflight: the frontend is usually opened from file:// or
+        # another port
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.end_headers()
+
+    def _stream(self, topic: Optional[str]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        try:
+            for event, data in self.proxy.stream(topic):
+                self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The browser went away; parts still finishing are cached anyway
+            pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            self._send_json(200, self.proxy.stats())
+        elif url.path == "/stream":
+            self._stream(parse_qs(url.query).get("topic", [None])[0])
+        else:
+            self._send_json(404, {"success": False, "error": "Not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path not in ("/", f"/webhook/{WEBHOOK_PATH}"):
+            self._send_json(404, {"success": False, "error": "Not found"})
+            return
+
+        try:
+            body, source = self.proxy.generate(self._read_topic())
+        except UpstreamError as e:
+            self._send_json(e.status, {"success": False, "error": str(e)})
+            return
+        self._send_json(200, body, {"X-Cache": source})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(proxy: WebhookProxy, host: str = "127.0.0.1", port: int = 8787,
+                  verbose: bool = False) -> ThreadingHTTPServer:
+    """Create (but don't start) a threaded HTTP server fronting ``proxy``."""
+    handler = type("BoundProxyHandler", (ProxyHandler,), {"proxy": proxy})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Run the caching proxy."""
+    parser = argparse.ArgumentParser(description="Caching proxy for the poem & joke webhook")
+    parser.add_argument("--upstream", default=default_webhook_url(), help="webhook URL (default: N8N_WEBHOOK_URL)")
+    parser.add_argument("--stream-parts", action="store_true",
+                        help="serve /stream from the single-part webhook (deploy it first)")
+    parser.add_argument("--part-upstream",
+                        help="single-part webhook URL; implies --stream-parts (default: N8N_PART_WEBHOOK_URL)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ttl", type=float, default=3600.0, help="seconds an answer is cached")
+    parser.add_argument("--max-entries", type=int, default=1024, help="entries kept in memory")
+    parser.add_argument("--cache-db", default=DEFAULT_CACHE_PATH,
+                        help="SQLite file for the disk tier ('' to keep the cache in memory only)")
+    parser.add_argument("--wait-timeout", type=float,
+                        help="seconds a coalesced request waits for the shared webhook call")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    try:
+        cache = ResponseCache(args.max_entries, args.ttl, args.cache_db or None)
+        proxy = WebhookProxy(
+            args.upstream,
+            cache,
+            wait_timeout=args.wait_timeout,
+            part_url=args.part_upstream or (
+                default_webhook_url("N8N_PART_WEBHOOK_URL", PART_WEBHOOK_PATH) if args.stream_parts else None
+            ),
+        )
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    server = create_server(proxy, args.host, args.port, args.verbose)
+    print("🪝 Webhook proxy running")
+    print("=" * 50)
+    print(f"📡 Listening: http://{args.host}:{args.port}/")
+    print(f"🔗 Upstream:  {args.upstream}")
+    print(f"🌊 Stream:    http://{args.host}:{args.port}/stream?topic=...")
+    print(f"📊 Stats:     http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+        proxy.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Workflow Cache
+Local LRU cache of n8n workflow bodies for N8nClient.get_workflow().
+
+Entries are revalidated cheaply: every workflow listing carries ``updatedAt``,
+so listing pages passing through N8nClient.iter_workflows() confirm or evict
+cached bodies without downloading them. Entries that haven't been confirmed
+recently are revalidated with a conditional GET (If-None-Match) when the
+server supplied an ETag, and refetched otherwise.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+class WorkflowCache:
+    """Size-bounded, optionally persistent cache of workflow bodies keyed by ID."""
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None, max_age: float = 60.0):
+        """
+        Args:
+            max_entries: Least recently used bodies beyond this are evicted.
+            path: JSON file to load from and save to. None keeps the cache in memory.
+            max_age: Seconds a body is served without revalidation after it was
+                fetched or confirmed by a listing / 304 response.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, workflow_id: str) -> bool:
+        return workflow_id in self._entries
+
+    def lookup(self, workflow_id: str) -> Optional[Dict]:
+        """
+        Return the cache entry for ``workflow_id`` (keys ``workflow``,
+        ``updatedAt``, ``etag``, ``validated``) and mark it recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is not None:
+                self._entries.move_to_end(workflow_id)
+            return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """True if the entry was validated within ``max_age`` seconds."""
+        return time.time() - entry.get("validated", 0) < self.max_age
+
+    def get(self, workflow_id: str) -> Optional[Dict]:
+        """Return a copy of a fresh cached body, or None."""
+        entry = self.lookup(workflow_id)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        self.hits += 1
+        return copy.deepcopy(entry["workflow"])
+
+    def put(self, workflow_id: str, workflow: Dict, etag: Optional[str] = None) -> None:
+        """Store a freshly fetched body (counted as a miss)."""
+        self.misses += 1
+        with self._lock:
+            self._entries[workflow_id] = {
+                "workflow": copy.deepcopy(workflow),
+                "updatedAt": workflow.get("updatedAt"),
+                "etag": etag,
+                "validated": time.time(),
+            }
+            self._entries.move_to_end(workflow_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, workflow_id: str) -> None:
+        """Mark an entry as confirmed current (e.g. after a 304)."""
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is not None:
+                entry["validated"] = time.time()
+        self.revalidations += 1
+
+    def observe(self, summary: Dict) -> None:
+        """
+        Revalidate against a listing entry: keep the body if ``updatedAt``
+        matches, evict it otherwise.
+        """
+        workflow_id = summary.get("id")
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is None:
+                return
+            if entry.get("updatedAt") and entry["updatedAt"] == summary.get("updatedAt"):
+                entry["validated"] = time.time()
+            else:
+                del self._entries[workflow_id]
+
+    def retain(self, workflow_ids: Iterable[str]) -> None:
+        """Evict every entry whose ID is not in ``workflow_ids`` (deleted workflows)."""
+        keep = set(workflow_ids)
+        with self._lock:
+            for workflow_id in [key for key in self._entries if key not in keep]:
+                del self._entries[workflow_id]
+
+    def invalidate(self, workflow_id: Optional[str] = None) -> None:
+        """Drop one entry, or everything when no ID is given."""
+        with self._lock:
+            if workflow_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(workflow_id, None)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,  # full body downloads
+            "revalidations": self.revalidations,
+        }
+
+    def load(self) -> None:
+        """Load entries from ``path``."""
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self._entries = OrderedDict(data.get("entries", []))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Write entries to ``path`` atomically (LRU order is preserved)."""
+        if not self.path:
+            return
+        # Serialized under the lock: touch() and observe() update entries in place
+        with self._lock:
+            text = json.dumps({"entries": list(self._entries.items())})
+        # Per-thread temp file so concurrent saves don't write into each other
+        tmp_path = f"{self.path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,297 @@
+"""
+Workflow Export
+Incrementally exports live n8n workflows to a git-friendly directory.
+
+Every run lists workflows in summary mode and compares each ``updatedAt``
+with the previous run's state file. Only new or changed workflows are
+fetched (concurrently), so a run over an unchanged instance costs the
+listing and nothing else. Workflows deleted in n8n are removed from disk.
+
+Each workflow gets its own directory::
+
+    exports/
+        poem-joke-generator-AbC123/
+            workflow.json          # canonical JSON: sorted keys, nodes by name
+            code/
+                format-response.js # jsCode of the "Format Response" node
+
+Fields that change on every save without changing behaviour (``updatedAt``,
+``versionId``) are left out, and files are only rewritten when their content
+changed, so ``git diff`` shows exactly what was edited. ``load_export()``
+reassembles a workflow (code included) from its directory.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from n8n_client import N8nClient
+from workflow_sync import PROJECT_DIR, load_state, save_state
+
+DEFAULT_EXPORT_DIR = os.path.join(PROJECT_DIR, "exports")
+DEFAULT_STATE_PATH = os.path.join(PROJECT_DIR, ".n8n_export_state.json")
+
+WORKFLOW_FILE = "workflow.json"
+CODE_DIR = "code"
+
+# Fields that change on every save in the n8n UI even when nothing else did
+VOLATILE_FIELDS = ("updatedAt", "versionId", "triggerCount")
+
+# Node parameters holding JavaScript, written to .js files next to the JSON
+CODE_PARAMETERS = ("jsCode", "functionCode")
+
+# Key marking a parameter whose value lives in a file, relative to the workflow directory
+FILE_REFERENCE = "$file"
+
+
+@dataclass
+class ExportResult:
+    """Outcome of exporting one workflow."""
+    workflow_id: str
+    name: str
+    action: str  # "write", "unchanged", "skip", "delete" or "error"
+    path: Optional[str] = None
+    error: Optional[str] = None
+
+
+def slugify(value: str, fallback: str = "workflow") -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", (value or "").lower()).strip("-")
+    return slug[:60].rstrip("-") or fallback
+
+
+def workflow_dirname(workflow: Dict) -> str:
+    """Directory name for a workflow: readable name plus the stable ID."""
+    return f"{slugify(workflow.get('name'))}-{workflow.get('id')}"
+
+
+def split_workflow(workflow: Dict) -> Dict[str, str]:
+    """
+    Render a workflow as ``{relative path: file content}``: the canonical
+    workflow.json plus one .js file per code parameter.
+    """
+    data = {key: value for key, value in workflow.items() if key not in VOLATILE_FIELDS}
+    files: Dict[str, str] = {}
+    used_names = set()
+
+    nodes = []
+    for node in sorted(data.get("nodes", []), key=lambda node: node.get("name", "")):
+        node = dict(node)
+        parameters = dict(node.get("parameters") or {})
+        for key in CODE_PARAMETERS:
+            code = parameters.get(key)
+            if not isinstance(code, str):
+                continue
+            base = slugify(node.get("name"), "node") + ("" if key == "jsCode" else f"-{slugify(key)}")
+            filename, suffix = base, 2
+            while filename in used_names:
+                filename, suffix = f"{base}-{suffix}", suffix + 1
+            used_names.add(filename)
+            path = f"{CODE_DIR}/{filename}.js"
+            # Always one extra newline (stripped again on load), so code that
+            # ends with its own newline round-trips exactly
+            files[path] = code + "\n"
+            parameters[key] = {FILE_REFERENCE: path}
+        if "parameters" in node:
+            node["parameters"] = parameters
+        nodes.append(node)
+    data["nodes"] = nodes
+    if data.get("tags"):
+        data["tags"] = sorted(data["tags"], key=lambda tag: tag.get("name", "") if isinstance(tag, dict) else str(tag))
+
+    # Indented so every node parameter is its own line in diffs
+    files[WORKFLOW_FILE] = json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    return files
+
+
+def load_export(directory: str) -> Dict:
+    """Reassemble a workflow exported by split_workflow(), inlining its code files."""
+    with open(os.path.join(directory, WORKFLOW_FILE), encoding="utf-8") as f:
+        workflow = json.load(f)
+    for node in workflow.get("nodes", []):
+        parameters = node.get("parameters") or {}
+        for key, value in parameters.items():
+            if isinstance(value, dict) and set(value) == {FILE_REFERENCE}:
+                with open(os.path.join(directory, value[FILE_REFERENCE]), encoding="utf-8") as f:
+                    code = f.read()
+                parameters[key] = code[:-1] if code.endswith("\n") else code
+    return workflow
+
+
+def write_files(directory: str, files: Dict[str, str]) -> bool:
+    """
+    Write ``files`` under ``directory``, leaving identical files untouched and
+    removing code files that are no longer referenced. Returns True if
+    anything on disk changed.
+    """
+    changed = False
+    for relative, content in files.items():
+        path = os.path.join(directory, relative)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                if f.read() == content:
+                    continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        changed = True
+
+    code_dir = os.path.join(directory, CODE_DIR)
+    if os.path.isdir(code_dir):
+        for filename in os.listdir(code_dir):
+            if f"{CODE_DIR}/{filename}" not in files:
+                os.remove(os.path.join(code_dir, filename))
+                changed = True
+        if not os.listdir(code_dir):
+            os.rmdir(code_dir)
+    return changed
+
+
+def export_workflow(client: N8nClient, summary: Dict, export_dir: str,
+                    previous_path: Optional[str] = None) -> ExportResult:
+    """Fetch one workflow and write it out, moving its directory if it was renamed."""
+    workflow_id = summary.get("id")
+    workflow = client.get_workflow(workflow_id)
+    dirname = workflow_dirname(workflow)
+    directory = os.path.join(export_dir, dirname)
+
+    if previous_path and previous_path != dirname:
+        old_directory = os.path.join(export_dir, previous_path)
+        if os.path.isdir(old_directory) and not os.path.exists(directory):
+            os.rename(old_directory, directory)
+
+    changed = write_files(directory, split_workflow(workflow))
+    return ExportResult(workflow_id, workflow.get("name"), "write" if changed else "unchanged", dirname)
+
+
+def export_workflows(
+    client: N8nClient,
+    export_dir: str = DEFAULT_EXPORT_DIR,
+    state: Optional[Dict] = None,
+    full: bool = False,
+    prune: bool = True,
+    max_workers: int = 8,
+) -> List[ExportResult]:
+    """
+    Export every workflow whose ``updatedAt`` differs from ``state`` (the
+    per-instance section of the state file, updated in place). ``full``
+    ignores the state and refetches everything.
+    """
+    records = state if state is not None else {}
+    listing = {workflow.get("id"): workflow for workflow in client.iter_workflows(limit=250, summary=True)}
+    os.makedirs(export_dir, exist_ok=True)
+
+    results: List[ExportResult] = []
+    pending = []
+    for workflow_id, summary in listing.items():
+        record = records.get(workflow_id)
+        if (
+            not full
+            and record
+            and record.get("updatedAt") == summary.get("updatedAt")
+            and os.path.isdir(os.path.join(export_dir, record.get("path", "")))
+        ):
+            results.append(ExportResult(workflow_id, summary.get("name"), "skip", record.get("path")))
+        else:
+            pending.append(summary)
+
+    def run(summary: Dict) -> ExportResult:
+        workflow_id = summary.get("id")
+        try:
+            previous = (records.get(workflow_id) or {}).get("path")
+            return export_workflow(client, summary, export_dir, previous)
+        except Exception as e:
+            return ExportResult(workflow_id, summary.get("name"), "error", error=str(e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        exported = list(pool.map(run, pending))
+    results.extend(exported)
+
+    for result in exported:
+        if result.action != "error":
+            records[result.workflow_id] = {
+                "name": result.name,
+                "path": result.path,
+                "updatedAt": listing[result.workflow_id].get("updatedAt"),
+            }
+
+    if prune:
+        for workflow_id in [workflow_id for workflow_id in records if workflow_id not in listing]:
+            record = records.pop(workflow_id)
+            directory = os.path.join(export_dir, record.get("path") or "")
+            if record.get("path") and os.path.isdir(directory):
+                shutil.rmtree(directory)
+            results.append(ExportResult(workflow_id, record.get("name"), "delete", record.get("path")))
+    return results
+
+
+def print_results(results: List[ExportResult], elapsed: float, verbose: bool = False) -> None:
+    icons = {"write": "✏️ ", "unchanged": "🟰", "skip": "⏭️ ", "delete": "🗑️ ", "error": "❌"}
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.action] = counts.get(result.action, 0) + 1
+        if verbose or result.action in ("write", "delete", "error"):
+            detail = result.error or result.path or ""
+            print(f"  {icons.get(result.action, '•')} {result.action:<9} {result.name} {detail}")
+    summary = ", ".join(f"{count} {action}" for action, count in sorted(counts.items()))
+    print(f"✨ Exported in {elapsed:.1f}s: {summary or 'no workflows'}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Export workflows from n8n, once or repeatedly."""
+    parser = argparse.ArgumentParser(description="Export n8n workflows to a git-friendly directory")
+    parser.add_argument("--dir", default=DEFAULT_EXPORT_DIR, help="export directory")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="export state file")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent workflow fetches")
+    parser.add_argument("--full", action="store_true", help="refetch every workflow, ignoring the state file")
+    parser.add_argument("--no-prune", action="store_true", help="keep exports of workflows deleted in n8n")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="keep exporting every SECONDS")
+    parser.add_argument("--verbose", action="store_true", help="list skipped and unchanged workflows too")
+    args = parser.parse_args(argv)
+
+    print("\n📦 Exporting workflows from n8n")
+    print("=" * 50)
+
+    try:
+        client = N8nClient(pool_maxsize=args.workers)
+    except ValueError as e:
+        print(f"❌ Configuration Error: {e}")
+        return 1
+
+    state = load_state(args.state)
+    instance_state = state.setdefault(client.api_url, {})
+    full = args.full
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                results = export_workflows(client, args.dir, instance_state, full, not args.no_prune, args.workers)
+            except Exception as e:
+                # A failed listing leaves the state as it was; the next pass retries
+                if not args.watch:
+                    raise
+                print(f"❌ Error: {e}")
+            else:
+                save_state(args.state, state)
+                print_results(results, time.monotonic() - started, args.verbose)
+                if not args.watch:
+                    return 1 if any(result.action == "error" for result in results) else 0
+                full = False
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+"""
+Workflow Graph Analyzer
+Offline latency analysis of n8n workflow definitions.
+
+Parses the DAG encoded by a workflow's ``nodes`` and ``connections``, applies
+per-node-type latency estimates and reports:
+
+- the critical path and its latency (the lower bound if branches overlapped)
+- the sequential latency, which is what n8n itself delivers since it runs one
+  node at a time within an execution
+- fan-in nodes that block on their slowest branch, including non-Merge nodes
+  that n8n runs once per incoming branch
+- nodes that wait on predecessors whose output they never use and could be
+  wired to start earlier
+
+Only one output of an IF / Switch node runs per item, so those branches are
+treated as alternatives and the slowest combination is reported.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from itertools import product
+from typing import Dict, List, Optional, Set, Tuple
+
+from workflow_sync import DEFAULT_WORKFLOWS_DIR, discover_definitions, load_definition
+
+# Rough per-node latency estimates in seconds, keyed by node type
+DEFAULT_LATENCY_PROFILE = {
+    "n8n-nodes-base.manualTrigger": 0.0,
+    "n8n-nodes-base.webhook": 0.0,
+    "n8n-nodes-base.scheduleTrigger": 0.0,
+    "n8n-nodes-base.set": 0.005,
+    "n8n-nodes-base.merge": 0.005,
+    "n8n-nodes-base.if": 0.005,
+    "n8n-nodes-base.switch": 0.005,
+    "n8n-nodes-base.code": 0.05,
+    "n8n-nodes-base.respondToWebhook": 0.01,
+    "n8n-nodes-base.httpRequest": 0.5,
+    "n8n-nodes-base.airtable": 0.4,
+    "n8n-nodes-base.linkedIn": 1.0,
+    "@n8n/n8n-nodes-langchain.openAi": 4.0,
+}
+DEFAULT_NODE_LATENCY = 0.1
+
+# Node types that wait for all inputs and run once
+JOIN_NODE_TYPES = ("n8n-nodes-base.merge",)
+
+# Node types that route each item to exactly one of their outputs
+BRANCH_NODE_TYPES = ("n8n-nodes-base.if", "n8n-nodes-base.switch")
+
+# Beyond this many IF / Switch output combinations every output is assumed to run
+MAX_BRANCH_SCENARIOS = 256
+
+# References to another node's output inside expressions or code
+_NAMED_REFERENCE = re.compile(
+    r"""\$\(\s*['"](?P<a>[^'"]+)['"]\s*\)"""
+    r"""|\$node\[\s*['"](?P<b>[^'"]+)['"]\s*\]"""
+    r"""|\$items\(\s*['"](?P<c>[^'"]+)['"]"""
+)
+# Use of the node's own input items
+_INPUT_REFERENCE = re.compile(r"\$json|\$input|\$binary|\bitems\b")
+
+# Latency differences below this are not worth reporting
+_EPSILON = 1e-6
+
+
+class LatencyProfile:
+    """Latency estimates per node name (most specific) or node type."""
+
+    def __init__(self, types: Optional[Dict[str, float]] = None, nodes: Optional[Dict[str, float]] = None,
+                 default: float = DEFAULT_NODE_LATENCY):
+        self.types = dict(DEFAULT_LATENCY_PROFILE)
+        self.types.update(types or {})
+        self.nodes = dict(nodes or {})
+        self.default = default
+
+    @classmethod
+    def load(cls, path: str) -> "LatencyProfile":
+        """Load ``{"types": {...}, "nodes": {...}, "default": s}`` from JSON."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("types"), data.get("nodes"), data.get("default", DEFAULT_NODE_LATENCY))
+
+    def latency(self, node: Dict) -> float:
+        if node.get("name") in self.nodes:
+            return self.nodes[node["name"]]
+        return self.types.get(node.get("type"), self.default)
+
+    def is_known(self, node: Dict) -> bool:
+        return node.get("name") in self.nodes or node.get("type") in self.types
+
+
+def _strings(value) -> List[str]:
+    """Every string nested in a parameter structure."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for item in value.values() for s in _strings(item)]
+    if isinstance(value, list):
+        return [s for item in value for s in _strings(item)]
+    return []
+
+
+class WorkflowGraph:
+    """Nodes and directed edges of one workflow."""
+
+    def __init__(self, workflow: Dict):
+        self.name = workflow.get("name", "")
+        self.nodes: Dict[str, Dict] = {node["name"]: node for node in workflow.get("nodes", [])}
+        self.successors: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        self.predecessors: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        # (source, target, source output index)
+        self.edges: List[Tuple[str, str, int]] = []
+        self.warnings: List[str] = []
+
+        for source, outputs in (workflow.get("connections") or {}).items():
+            if source not in self.nodes:
+                self.warnings.append(f"Connection from unknown node '{source}'")
+                continue
+            for branches in outputs.values():
+                for output, branch in enumerate(branches or []):
+                    for target in branch or []:
+                        name = target.get("node")
+                        if name not in self.nodes:
+                            self.warnings.append(f"Connection from '{source}' to unknown node '{name}'")
+                            continue
+                        self.successors[source].append(name)
+                        self.predecessors[name].append(source)
+                        self.edges.append((source, name, output))
+
+    def topological_order(self) -> List[str]:
+        """Nodes in dependency order; edges closing a cycle are ignored (and reported)."""
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            state[name] = 1
+            for successor in self.successors[name]:
+                if state.get(successor) == 1:
+                    self.warnings.append(f"Cycle through '{name}' -> '{successor}' ignored")
+                elif successor not in state:
+                    visit(successor)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes:
+            if name not in state:
+                visit(name)
+        order.reverse()
+        return order
+
+    def branch_scenarios(self) -> List[Dict[str, int]]:
+        """
+        Every combination of IF / Switch outputs, as ``{node: output}``. Falls
+        back to a single scenario in which all outputs run when there are too
+        many combinations.
+        """
+        outputs: Dict[str, List[int]] = {}
+        for source, _, output in self.edges:
+            if self.nodes[source].get("type") in BRANCH_NODE_TYPES:
+                outputs.setdefault(source, [])
+                if output not in outputs[source]:
+                    outputs[source].append(output)
+
+        count = 1
+        for choices in outputs.values():
+            count *= len(choices)
+        if count > MAX_BRANCH_SCENARIOS:
+            self.warnings.append(f"{count} IF/Switch combinations; assuming every branch runs")
+            return [{}]
+        names = list(outputs)
+        return [dict(zip(names, choice)) for choice in product(*(outputs[name] for name in names))]
+
+    def active_predecessors(self, scenario: Dict[str, int]) -> Dict[str, List[str]]:
+        """Predecessors of the nodes that run when branch nodes take ``scenario``'s outputs."""
+        preds: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for source, target, output in self.edges:
+            if scenario.get(source, output) == output:
+                preds[target].append(source)
+
+        # Drop nodes only reachable through outputs that weren't taken
+        active = {name for name, sources in preds.items() if not self.predecessors[name]}
+        changed = True
+        while changed:
+            changed = False
+            for name, sources in preds.items():
+                if name not in active and any(source in active for source in sources):
+                    active.add(name)
+                    changed = True
+        return {name: [s for s in sources if s in active] for name, sources in preds.items() if name in active}
+
+    def references(self, name: str) -> Set[str]:
+        """Other nodes whose output ``name`` reads by name."""
+        refs = set()
+        for text in _strings(self.nodes[name].get("parameters", {})):
+            for match in _NAMED_REFERENCE.finditer(text):
+                refs.add(match.group("a") or match.group("b") or match.group("c"))
+        refs.discard(name)
+        return {ref for ref in refs if ref in self.nodes}
+
+    def uses_input(self, name: str) -> bool:
+        """True if the node reads its incoming items (``$json``, ``$input``, ...)."""
+        return any(_INPUT_REFERENCE.search(text) for text in _strings(self.nodes[name].get("parameters", {})))
+
+
+def _schedule(
+    graph: WorkflowGraph,
+    order: List[str],
+    position: Dict[str, int],
+    predecessors: Dict[str, List[str]],
+    latency: Dict[str, float],
+) -> Tuple[Dict[str, float], Dict[str, Optional[str]], Dict[str, int]]:
+    """
+    Earliest finish time of each active node if independent branches
+    overlapped, the predecessor it waited on last, and how many times n8n
+    runs it (once per incoming branch unless it's a join).
+    """
+    finish: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    runs: Dict[str, int] = {}
+    for name in order:
+        if name not in predecessors:
+            continue
+        preds = [p for p in predecessors[name] if position[p] < position[name]]
+        ready = max((finish[p] for p in preds), default=0.0)
+        via[name] = max(preds, key=lambda p: finish[p]) if preds else None
+        finish[name] = ready + latency[name]
+        if not preds or graph.nodes[name].get("type") in JOIN_NODE_TYPES:
+            runs[name] = 1
+        else:
+            runs[name] = sum(runs[p] for p in preds)
+    return finish, via, runs
+
+
+def analyze_workflow(workflow: Dict, profile: Optional[LatencyProfile] = None) -> Dict:
+    """Analyze one workflow definition and return a JSON-serializable report."""
+    profile = profile or LatencyProfile()
+    graph = WorkflowGraph(workflow)
+    order = graph.topological_order()
+    position = {name: i for i, name in enumerate(order)}
+
+    latency = {name: profile.latency(node) for name, node in graph.nodes.items()}
+    unknown_types = sorted({
+        node.get("type") for node in graph.nodes.values() if not profile.is_known(node)
+    })
+
+    # Analyze the slowest combination of IF / Switch outputs
+    worst = None
+    for scenario in graph.branch_scenarios():
+        predecessors = graph.active_predecessors(scenario)
+        finish, via, runs = _schedule(graph, order, position, predecessors, latency)
+        sequential = sum(latency[name] * runs[name] for name in runs)
+        if worst is None or sequential > worst[0]:
+            worst = (sequential, predecessors, finish, via, runs)
+    sequential, predecessors, finish, via, runs = worst
+    order = [name for name in order if name in predecessors]
+
+    end = max(finish, key=finish.get) if finish else None
+    critical_path: List[str] = []
+    node = end
+    while node is not None:
+        critical_path.append(node)
+        node = via[node]
+    critical_path.reverse()
+
+    fan_in = []
+    for name in order:
+        sources = sorted(set(predecessors[name]), key=lambda p: finish.get(p, 0.0))
+        if len(sources) < 2:
+            continue
+        ready_times = {source: round(finish[source], 3) for source in sources}
+        entry = {
+            "node": name,
+            "branches": ready_times,
+            "slowest_branch": sources[-1],
+            "blocked_for": round(finish[sources[-1]] - finish[sources[0]], 3),
+            "is_join": graph.nodes[name].get("type") in JOIN_NODE_TYPES,
+            "runs": runs[name],
+        }
+        fan_in.append(entry)
+
+    # Nodes that only read named upstream nodes (not their own input) but are
+    # wired behind something slower than those nodes
+    early_start = []
+    for name in order:
+        preds = predecessors[name]
+        refs = {ref for ref in graph.references(name) if ref in finish}
+        if not preds or not refs or graph.uses_input(name):
+            continue
+        ready_now = max(finish[p] for p in preds)
+        ready_needed = max(finish[ref] for ref in refs)
+        if ready_now - ready_needed > _EPSILON:
+            early_start.append({
+                "node": name,
+                "waits_on": sorted(set(preds)),
+                "uses": sorted(refs),
+                "could_start_after": max(refs, key=lambda ref: finish[ref]),
+                "saving": round(ready_now - ready_needed, 3),
+            })
+
+    warnings = list(graph.warnings)
+    for entry in fan_in:
+        if not entry["is_join"]:
+            warnings.append(
+                f"'{entry['node']}' has {len(entry['branches'])} incoming branches but is not a Merge node; "
+                f"n8n runs it {entry['runs']} times"
+            )
+    if unknown_types:
+        warnings.append(f"No latency estimate for {', '.join(unknown_types)}; using {profile.default}s")
+
+    return {
+        "name": graph.name,
+        "nodes": len(graph.nodes),
+        "critical_path": critical_path,
+        "critical_path_latency": round(finish[end], 3) if end else 0.0,
+        "sequential_latency": round(sequential, 3),
+        "fan_in": fan_in,
+        "early_start": early_start,
+        "warnings": warnings,
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Human-readable rendering of analyze_workflow() output."""
+    lines = [
+        f"📋 {report['name']} ({report['nodes']} nodes)",
+        f"   ⏱️  Sequential latency (n8n engine): {report['sequential_latency']:.2f}s",
+        f"   🛤️  Critical path: {report['critical_path_latency']:.2f}s  "
+        + " → ".join(report["critical_path"]),
+    ]
+    for entry in report["fan_in"]:
+        branches = ", ".join(f"{name} @{ready:.2f}s" for name, ready in entry["branches"].items())
+        lines.append(
+            f"   🔀 Fan-in '{entry['node']}' blocks {entry['blocked_for']:.2f}s on "
+            f"'{entry['slowest_branch']}' ({branches})"
+        )
+    for entry in report["early_start"]:
+        lines.append(
+            f"   ⚡ '{entry['node']}' only uses {', '.join(entry['uses'])}; wiring it after "
+            f"'{entry['could_start_after']}' instead of {', '.join(entry['waits_on'])} saves {entry['saving']:.2f}s"
+        )
+    for warning in report["warnings"]:
+        lines.append(f"   ⚠️  {warning}")
+    return "\n".join(lines)
+
+
+def load_workflows(paths: List[str]) -> List[Dict]:
+    """
+    Load definitions from ``.py`` modules exposing build_workflow(), workflow
+    JSON files, or directories of either. No paths means workflows/.
+    """
+    def load_json(path: str) -> List[Dict]:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else [data]
+
+    workflows: List[Dict] = []
+    for path in paths or [DEFAULT_WORKFLOWS_DIR]:
+        if os.path.isdir(path):
+            workflows.extend(discover_definitions(path))
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".json"):
+                    workflows.extend(load_json(os.path.join(path, name)))
+        elif path.endswith(".json"):
+            workflows.extend(load_json(path))
+        else:
+            definition = load_definition(path)
+            if definition is not None:
+                workflows.append(definition)
+    return workflows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Analyze workflow definitions and print latency reports."""
+    parser = argparse.ArgumentParser(description="Estimate workflow latency from its node graph")
+    parser.add_argument("paths", nargs="*", help="workflow .py/.json files or directories (default: workflows/)")
+    parser.add_argument("--profile", help="JSON latency profile overriding the defaults")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--budget", type=float, help="fail if any sequential latency exceeds this many seconds")
+    args = parser.parse_args(argv)
+
+    profile = LatencyProfile.load(args.profile) if args.profile else LatencyProfile()
+    reports = [analyze_workflow(workflow, profile) for workflow in load_workflows(args.paths)]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print("\n\n".join(format_report(report) for report in reports))
+
+    if args.budget is not None:
+        over = [report["name"] for report in reports if report["sequential_latency"] > args.budget]
+        if over:
+            if not args.json:
+                print(f"\n❌ Over the {args.budget:.2f}s budget: {', '.join(over)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,485 @@
+"""
+Workflow Store
+Content-addressed SQLite history of every workflow version seen.
+
+A version is split into pieces that are stored by hash, once, however many
+versions or workflows share them:
+
+- long strings in node parameters (``jsCode``, prompts) become string blobs
+- each node, minus its ``id`` and ``position``, becomes a node blob that
+  refers to its string blobs
+- ``connections`` and the remaining top-level fields become their own blobs
+- a manifest lists the node blobs with each node's id and position
+
+Blobs are zlib-compressed canonical JSON. A version row only holds the
+workflow ID, timestamps and the manifest hash, indexed by (workflow, time),
+so point-in-time lookups are one index probe. Diffs compare two manifests
+and load only the nodes whose hashes differ, so neither the store's size
+nor diff time grows with how many versions it holds, only with how much
+actually changed.
+
+Attach a store to N8nClient to record every body get_workflow() fetches::
+
+    n8n = N8nClient(store=WorkflowStore())
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+DEFAULT_STORE_PATH = ".n8n_workflow_store.db"
+
+# Parameter strings at least this long are stored as separate blobs
+MIN_BLOB_STRING_LENGTH = 128
+
+# Top-level fields kept on the version row rather than in the content,
+# since they change on every save
+VERSION_FIELDS = ("updatedAt", "versionId")
+
+# Node fields kept in the manifest: they differ between otherwise identical
+# nodes (generated IDs) or change when a node is merely dragged
+NODE_PLACEMENT_FIELDS = ("id", "position")
+
+# Marks a value stored as a blob: {"$blob": "<hash>"}
+BLOB_REFERENCE = "$blob"
+
+# Decompressed blobs kept in memory; blobs are immutable so this never goes stale
+BLOB_CACHE_SIZE = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow_id TEXT NOT NULL,
+    name TEXT,
+    manifest TEXT NOT NULL REFERENCES blobs (hash),
+    updated_at TEXT,
+    version_id TEXT,
+    size INTEGER NOT NULL,
+    at REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS versions_by_time ON versions (workflow_id, at);
+"""
+
+Timestamp = Union[str, float, datetime]
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _to_epoch(value: Optional[Timestamp]) -> Optional[float]:
+    """Seconds since the epoch for an ISO 8601 string (``...Z``), datetime or number."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _is_reference(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_REFERENCE in value
+
+
+def connection_edges(connections: Dict) -> Set[Tuple[str, str, int, str, int]]:
+    """Flatten n8n connections into (source, type, output, target, input) edges."""
+    edges = set()
+    for source, by_type in (connections or {}).items():
+        for connection_type, outputs in (by_type or {}).items():
+            for output, targets in enumerate(outputs or []):
+                for target in targets or []:
+                    edges.add((source, connection_type, output, target.get("node"), target.get("index", 0)))
+    return edges
+
+
+class WorkflowStore:
+    """Deduplicating, compressed version history of workflow bodies."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, min_blob_length: int = MIN_BLOB_STRING_LENGTH,
+                 compression_level: int = 6):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store).
+            min_blob_length: Parameter strings at least this long are
+                deduplicated on their own, not just as part of their node.
+            compression_level: zlib level for stored blobs.
+        """
+        self.path = path
+        self.min_blob_length = min_blob_length
+        self.compression_level = compression_level
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Blobs
+
+    def _put(self, data: Any) -> str:
+        """Store ``data`` once under the hash of its canonical JSON; return the hash."""
+        raw = _dumps(data)
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest in self._cache:
+            return digest
+        exists = self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if not exists:
+            self._conn.execute(
+                "INSERT INTO blobs (hash, size, data) VALUES (?, ?, ?)",
+                (digest, len(raw), zlib.compress(raw, self.compression_level)),
+            )
+        return digest
+
+    def _get(self, digest: str) -> Any:
+        """Load a blob (copied, so callers may modify it)."""
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                raw = self._cache[digest]
+            else:
+                row = self._conn.execute("SELECT data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+                if row is None:
+                    raise KeyError(f"Missing blob {digest}")
+                raw = zlib.decompress(row["data"])
+                self._cache[digest] = raw
+                while len(self._cache) > BLOB_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return json.loads(raw)
+
+    def _extract_strings(self, value: Any) -> Any:
+        """Replace long strings in a parameter structure with blob references."""
+        if isinstance(value, str) and len(value) >= self.min_blob_length:
+            return {BLOB_REFERENCE: self._put(value)}
+        if isinstance(value, dict):
+            return {key: self._extract_strings(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._extract_strings(item) for item in value]
+        return value
+
+    def _inline_strings(self, value: Any) -> Any:
+        if _is_reference(value):
+            return self._get(value[BLOB_REFERENCE])
+        if isinstance(value, dict):
+            return {key: self._inline_strings(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._inline_strings(item) for item in value]
+        return value
+
+    # Versions
+
+    def record(self, workflow: Dict) -> int:
+        """
+        Store a workflow body and return its version ID. If the content is the
+        same as the workflow's latest stored version, that version's ID is
+        returned and nothing new is stored.
+        """
+        workflow_id = str(workflow.get("id"))
+        with self._lock, self._conn:
+            nodes = []
+            for node in workflow.get("nodes", []):
+                content = {key: value for key, value in node.items() if key not in NODE_PLACEMENT_FIELDS}
+                if "parameters" in content:
+                    content["parameters"] = self._extract_strings(content["parameters"])
+                entry = {"name": node.get("name"), "blob": self._put(content)}
+                entry.update({key: node[key] for key in NODE_PLACEMENT_FIELDS if key in node})
+                nodes.append(entry)
+
+            rest = {key: value for key, value in workflow.items()
+                    if key not in VERSION_FIELDS and key not in ("nodes", "connections")}
+            manifest = self._put({
+                "workflow": self._put(rest),
+                "connections": self._put(workflow.get("connections") or {}),
+                # Kept in the workflow's own order so get() returns it unchanged
+                "nodes": nodes,
+            })
+
+            latest = self._conn.execute(
+                "SELECT id, manifest FROM versions WHERE workflow_id = ? ORDER BY at DESC, id DESC LIMIT 1",
+                (workflow_id,),
+            ).fetchone()
+            if latest is not None and latest["manifest"] == manifest:
+                return latest["id"]
+
+            now = time.time()
+            cursor = self._conn.execute(
+                "INSERT INTO versions (workflow_id, name, manifest, updated_at, version_id, size, at, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (workflow_id, workflow.get("name"), manifest, workflow.get("updatedAt"), workflow.get("versionId"),
+                 len(_dumps(workflow)), _to_epoch(workflow.get("updatedAt")) or now, now),
+            )
+            return cursor.lastrowid
+
+    def _version_row(self, version: int) -> sqlite3.Row:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM versions WHERE id = ?", (version,)).fetchone()
+        if row is None:
+            raise KeyError(f"No version {version}")
+        return row
+
+    @staticmethod
+    def _describe(row: sqlite3.Row) -> Dict:
+        return {
+            "version": row["id"],
+            "workflow_id": row["workflow_id"],
+            "name": row["name"],
+            "updatedAt": row["updated_at"],
+            "versionId": row["version_id"],
+            "recorded_at": row["recorded_at"],
+        }
+
+    def versions(self, workflow_id: str) -> List[Dict]:
+        """Every stored version of a workflow, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM versions WHERE workflow_id = ? ORDER BY at, id", (str(workflow_id),)
+            ).fetchall()
+        return [self._describe(row) for row in rows]
+
+    def workflows(self) -> List[Dict]:
+        """Latest stored version of every workflow."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT v.* FROM versions v JOIN ("
+                "  SELECT workflow_id, MAX(id) AS id FROM versions GROUP BY workflow_id"
+                ") latest ON latest.id = v.id ORDER BY v.name"
+            ).fetchall()
+        return [self._describe(row) for row in rows]
+
+    def version_at(self, workflow_id: str, when: Optional[Timestamp] = None) -> Optional[int]:
+        """ID of the version that was current at ``when`` (the latest if None)."""
+        at = _to_epoch(when) if when is not None else float("inf")
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM versions WHERE workflow_id = ? AND at <= ? ORDER BY at DESC, id DESC LIMIT 1",
+                (str(workflow_id), at),
+            ).fetchone()
+        return row["id"] if row else None
+
+    def get(self, version: int) -> Dict:
+        """Reassemble the full workflow body of a version."""
+        row = self._version_row(version)
+        manifest = self._get(row["manifest"])
+        workflow = self._get(manifest["workflow"])
+        workflow["connections"] = self._get(manifest["connections"])
+        nodes = []
+        for entry in manifest["nodes"]:
+            node = self._get(entry["blob"])
+            if "parameters" in node:
+                node["parameters"] = self._inline_strings(node["parameters"])
+            node.update({key: entry[key] for key in NODE_PLACEMENT_FIELDS if key in entry})
+            nodes.append(node)
+        workflow["nodes"] = nodes
+        if row["updated_at"] is not None:
+            workflow["updatedAt"] = row["updated_at"]
+        if row["version_id"] is not None:
+            workflow["versionId"] = row["version_id"]
+        return workflow
+
+    def get_at(self, workflow_id: str, when: Optional[Timestamp] = None) -> Optional[Dict]:
+        """The workflow as it was at ``when`` (the latest version if None)."""
+        version = self.version_at(workflow_id, when)
+        return self.get(version) if version is not None else None
+
+    def diff(self, old: int, new: int) -> Dict:
+        """
+        Node-level structural diff between two versions (of the same or
+        different workflows). Only nodes whose content hashes differ are loaded.
+        """
+        before = self._get(self._version_row(old)["manifest"])
+        after = self._get(self._version_row(new)["manifest"])
+        old_nodes = {entry["name"]: entry for entry in before["nodes"]}
+        new_nodes = {entry["name"]: entry for entry in after["nodes"]}
+
+        changed = []
+        moved = []
+        for name in sorted(old_nodes.keys() & new_nodes.keys()):
+            old_entry, new_entry = old_nodes[name], new_nodes[name]
+            if old_entry["blob"] != new_entry["blob"]:
+                changed.append({"node": name, "fields": self._changed_fields(old_entry["blob"], new_entry["blob"])})
+            elif old_entry.get("position") != new_entry.get("position"):
+                moved.append(name)
+
+        result: Dict[str, Any] = {
+            "added": sorted(new_nodes.keys() - old_nodes.keys()),
+            "removed": sorted(old_nodes.keys() - new_nodes.keys()),
+            "changed": changed,
+            "moved": moved,
+            "connections": {"added": [], "removed": []},
+            "workflow": [],
+        }
+        if before["connections"] != after["connections"]:
+            old_edges = connection_edges(self._get(before["connections"]))
+            new_edges = connection_edges(self._get(after["connections"]))
+            result["connections"] = {
+                "added": sorted(new_edges - old_edges),
+                "removed": sorted(old_edges - new_edges),
+            }
+        if before["workflow"] != after["workflow"]:
+            old_fields, new_fields = self._get(before["workflow"]), self._get(after["workflow"])
+            result["workflow"] = sorted(
+                key for key in old_fields.keys() | new_fields.keys() if old_fields.get(key) != new_fields.get(key)
+            )
+        return result
+
+    def _changed_fields(self, old_blob: str, new_blob: str) -> List[str]:
+        """Dotted names of the node fields (and parameters) that differ."""
+        old_node, new_node = self._get(old_blob), self._get(new_blob)
+        fields = []
+        for key in sorted(old_node.keys() | new_node.keys()):
+            old_value, new_value = old_node.get(key), new_node.get(key)
+            if old_value == new_value:
+                continue
+            if key == "parameters" and isinstance(old_value, dict) and isinstance(new_value, dict):
+                fields.extend(
+                    f"parameters.{name}" for name in sorted(old_value.keys() | new_value.keys())
+                    if old_value.get(name) != new_value.get(name)
+                )
+            else:
+                fields.append(key)
+        return fields
+
+    def stats(self) -> Dict:
+        """
+        Version, blob and size counts: ``version_bytes`` is what storing every
+        version whole would take, ``raw_bytes`` the deduplicated blobs and
+        ``stored_bytes`` the same blobs compressed.
+        """
+        with self._lock:
+            versions, workflows, version_bytes = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT workflow_id), COALESCE(SUM(size), 0) FROM versions"
+            ).fetchone()
+            blobs, raw_bytes, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "workflows": workflows,
+            "versions": versions,
+            "blobs": blobs,
+            "version_bytes": version_bytes,
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+        }
+
+
+def format_diff(diff: Dict) -> str:
+    lines = []
+    lines += [f"  + {name}" for name in diff["added"]]
+    lines += [f"  - {name}" for name in diff["removed"]]
+    lines += [f"  ~ {entry['node']}: {', '.join(entry['fields'])}" for entry in diff["changed"]]
+    lines += [f"  ↔ {name} (moved)" for name in diff["moved"]]
+    for sign, edges in (("+", diff["connections"]["added"]), ("-", diff["connections"]["removed"])):
+        lines += [f"  {sign} {source}[{output}] → {target}" for source, _, output, target, _ in edges]
+    if diff["workflow"]:
+        lines.append(f"  ~ workflow: {', '.join(diff['workflow'])}")
+    return "\n".join(lines) or "  (no changes)"
+
+
+def snapshot(client, store: WorkflowStore) -> Dict[str, int]:
+    """
+    Record every live workflow whose listing ``updatedAt`` isn't stored yet.
+    Returns counts of ``recorded`` and ``unchanged`` workflows.
+    """
+    latest = {entry["workflow_id"]: entry["updatedAt"] for entry in store.workflows()}
+    counts = {"recorded": 0, "unchanged": 0}
+    for summary in client.iter_workflows(limit=250, summary=True):
+        if latest.get(str(summary.get("id"))) == summary.get("updatedAt"):
+            counts["unchanged"] += 1
+            continue
+        store.record(client.get_workflow(summary.get("id")))
+        counts["recorded"] += 1
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Inspect the workflow version store."""
+    parser = argparse.ArgumentParser(description="Content-addressed history of n8n workflows")
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="store database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("snapshot", help="record every workflow changed since the last snapshot")
+    commands.add_parser("list", help="latest stored version of every workflow")
+    log = commands.add_parser("log", help="versions of a workflow")
+    log.add_argument("workflow_id")
+    show = commands.add_parser("show", help="print a version (or a workflow at a point in time) as JSON")
+    show.add_argument("workflow_id")
+    show.add_argument("--version", type=int, help="version ID")
+    show.add_argument("--at", help="ISO 8601 timestamp")
+    diff = commands.add_parser("diff", help="node-level diff between two versions")
+    diff.add_argument("old", type=int)
+    diff.add_argument("new", type=int)
+    diff.add_argument("--json", action="store_true")
+    commands.add_parser("stats", help="storage statistics")
+    args = parser.parse_args(argv)
+
+    with WorkflowStore(args.db) as store:
+        if args.command == "snapshot":
+            from n8n_client import N8nClient
+
+            try:
+                client = N8nClient()
+            except ValueError as e:
+                print(f"❌ Configuration Error: {e}")
+                return 1
+            with client:
+                counts = snapshot(client, store)
+            print(f"📸 Recorded {counts['recorded']} workflow(s), {counts['unchanged']} unchanged")
+        elif args.command == "list":
+            for entry in store.workflows():
+                print(f"  - {entry['name']} (ID: {entry['workflow_id']}) v{entry['version']} {entry['updatedAt'] or ''}")
+        elif args.command == "log":
+            for entry in store.versions(args.workflow_id):
+                print(f"  v{entry['version']:<6} {entry['updatedAt'] or '-':<26} {entry['name']}")
+        elif args.command == "show":
+            workflow = store.get(args.version) if args.version else store.get_at(args.workflow_id, args.at)
+            if workflow is None:
+                print(f"❌ No stored version of {args.workflow_id}")
+                return 1
+            print(json.dumps(workflow, indent=2, ensure_ascii=False))
+        elif args.command == "diff":
+            try:
+                result = store.diff(args.old, args.new)
+            except KeyError as e:
+                print(f"❌ Error: {e.args[0]}")
+                return 1
+            print(json.dumps(result, indent=2) if args.json else format_diff(result))
+        elif args.command == "stats":
+            stats = store.stats()
+            ratio = stats["version_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0.0
+            print(f"📚 {stats['versions']} version(s) of {stats['workflows']} workflow(s), "
+                  f"{stats['version_bytes']:,} bytes as full copies")
+            print(f"🧱 {stats['blobs']} unique blob(s): {stats['raw_bytes']:,} bytes deduplicated, "
+                  f"{stats['stored_bytes']:,} compressed ({ratio:.1f}x smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
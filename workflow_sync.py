@@ -0,0 +1,301 @@
+"""
+Workflow Sync
+Declaratively deploys the workflow definitions in workflows/ to n8n.
+
+Each definition is canonicalized and hashed, then compared against the live
+instance through a name -> id index built from the summary listing. Only
+workflows that are missing or changed cost an API call; everything else is
+skipped. Create/update calls run concurrently.
+"""
+
+import argparse
+import copy
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from n8n_client import N8nClient
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKFLOWS_DIR = os.path.join(PROJECT_DIR, "workflows")
+DEFAULT_STATE_PATH = os.path.join(PROJECT_DIR, ".n8n_sync_state.json")
+
+# Top-level fields n8n accepts when creating/updating a workflow
+DEPLOYABLE_FIELDS = ("name", "nodes", "connections", "settings", "staticData")
+
+# Node keys that n8n (or uuid4() in our definitions) regenerates on every
+# deploy, plus credentials which are attached by hand in the n8n UI
+VOLATILE_NODE_KEYS = ("id", "webhookId", "credentials")
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one workflow definition."""
+    name: str
+    action: str  # "create", "update", "skip" or "error"
+    workflow_id: Optional[str] = None
+    hash: Optional[str] = None
+    updated_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _strip_assignment_ids(parameters: Dict) -> Dict:
+    """
+    Drop the ``id`` of each Set-node assignment (generated with uuid4 on every
+    build of a definition); every other parameter is kept as it is.
+    """
+    assignments = parameters.get("assignments")
+    if not isinstance(assignments, dict) or not isinstance(assignments.get("assignments"), list):
+        return parameters
+    items = [
+        {key: value for key, value in item.items() if key != "id"} if isinstance(item, dict) else item
+        for item in assignments["assignments"]
+    ]
+    return {**parameters, "assignments": {**assignments, "assignments": items}}
+
+
+def canonicalize_workflow(workflow: Dict) -> Dict:
+    """
+    Reduce a workflow (local definition or live API response) to the parts
+    that define its behaviour, in a stable order.
+    """
+    nodes = []
+    for node in workflow.get("nodes", []):
+        node = {key: value for key, value in node.items() if key not in VOLATILE_NODE_KEYS}
+        if isinstance(node.get("parameters"), dict):
+            node["parameters"] = _strip_assignment_ids(node["parameters"])
+        nodes.append(node)
+
+    return {
+        "name": workflow.get("name"),
+        "nodes": sorted(nodes, key=lambda node: node.get("name", "")),
+        "connections": workflow.get("connections", {}),
+        "settings": workflow.get("settings") or {},
+    }
+
+
+def canonical_json(data) -> str:
+    """Serialize with sorted keys and no insignificant whitespace."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def workflow_hash(workflow: Dict) -> str:
+    """Content hash of a workflow's canonical form."""
+    return hashlib.sha256(canonical_json(canonicalize_workflow(workflow)).encode("utf-8")).hexdigest()
+
+
+def deployable_payload(workflow: Dict, live: Optional[Dict] = None) -> Dict:
+    """
+    Build a create/update body from a definition. When updating, credentials
+    attached to live nodes are carried over by node name so a deploy never
+    detaches them.
+    """
+    payload = {key: copy.deepcopy(workflow[key]) for key in DEPLOYABLE_FIELDS if key in workflow}
+    payload.setdefault("settings", {})
+    if live:
+        live_credentials = {
+            node.get("name"): node["credentials"]
+            for node in live.get("nodes", [])
+            if node.get("credentials")
+        }
+        for node in payload.get("nodes", []):
+            if "credentials" not in node and node.get("name") in live_credentials:
+                node["credentials"] = live_credentials[node["name"]]
+    return payload
+
+
+def load_definition(path: str) -> Optional[Dict]:
+    """Import a workflow module and return its ``build_workflow()`` result, if it has one."""
+    module_name = f"_workflow_def_{os.path.splitext(os.path.basename(path))[0]}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    build = getattr(module, "build_workflow", None)
+    return build() if callable(build) else None
+
+
+def discover_definitions(directory: str = DEFAULT_WORKFLOWS_DIR) -> List[Dict]:
+    """Import every module in ``directory`` that exposes ``build_workflow()``."""
+    definitions = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".py") or filename.startswith("_"):
+            continue
+        definition = load_definition(os.path.join(directory, filename))
+        if definition is not None:
+            definitions.append(definition)
+    return definitions
+
+
+def unstable_definitions(directory: str = DEFAULT_WORKFLOWS_DIR) -> List[str]:
+    """
+    Names of definitions whose hash differs between two builds (e.g. ids from
+    uuid4() inside parameters). Those would be updated on every sync.
+    """
+    first, second = discover_definitions(directory), discover_definitions(directory)
+    return [
+        before.get("name")
+        for before, after in zip(first, second)
+        if workflow_hash(before) != workflow_hash(after)
+    ]
+
+
+def build_index(client: N8nClient) -> Dict[str, Dict]:
+    """
+    Map workflow name -> listing summary for the live instance. If a name
+    exists more than once the most recently updated workflow wins.
+    """
+    index = {}
+    for workflow in client.iter_workflows(limit=250, summary=True):
+        current = index.get(workflow.get("name"))
+        if current is None or (workflow.get("updatedAt") or "") > (current.get("updatedAt") or ""):
+            index[workflow.get("name")] = workflow
+    return index
+
+
+def load_state(path: str) -> Dict:
+    """Load the last-deployed hashes, keyed by API URL then workflow name."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(path: str, state: Dict) -> None:
+    """Persist sync state atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def sync_workflow(
+    client: N8nClient,
+    definition: Dict,
+    live: Optional[Dict] = None,
+    record: Optional[Dict] = None,
+    dry_run: bool = False,
+) -> SyncResult:
+    """
+    Bring one live workflow in line with ``definition``.
+
+    ``live`` is the listing summary for the workflow of the same name (None if
+    it doesn't exist yet); ``record`` is what the previous sync deployed. If
+    neither side changed since then the workflow is skipped without any API
+    call, otherwise the live body is fetched and compared by hash.
+    """
+    name = definition.get("name")
+    local_hash = workflow_hash(definition)
+
+    if live is None:
+        if dry_run:
+            return SyncResult(name, "create", hash=local_hash)
+        created = client.create_workflow(deployable_payload(definition))
+        return SyncResult(name, "create", created.get("id"), local_hash, created.get("updatedAt"))
+
+    workflow_id = live.get("id")
+    if (
+        record
+        and record.get("id") == workflow_id
+        and record.get("hash") == local_hash
+        and record.get("updatedAt") == live.get("updatedAt")
+    ):
+        return SyncResult(name, "skip", workflow_id, local_hash, live.get("updatedAt"))
+
+    live_body = client.get_workflow(workflow_id)
+    if workflow_hash(live_body) == local_hash:
+        return SyncResult(name, "skip", workflow_id, local_hash, live_body.get("updatedAt"))
+
+    if dry_run:
+        return SyncResult(name, "update", workflow_id, local_hash, live.get("updatedAt"))
+    updated = client.update_workflow(workflow_id, deployable_payload(definition, live_body))
+    return SyncResult(name, "update", workflow_id, local_hash, updated.get("updatedAt"))
+
+
+def sync_definitions(
+    client: N8nClient,
+    definitions: List[Dict],
+    state: Optional[Dict] = None,
+    dry_run: bool = False,
+    max_workers: int = 8,
+    index: Optional[Dict[str, Dict]] = None,
+) -> List[SyncResult]:
+    """
+    Sync many definitions concurrently. ``state`` (the per-instance section of
+    the state file) is read to skip unchanged workflows and updated in place
+    with what was deployed. ``index`` is a build_index() result to reuse
+    instead of listing the instance again.
+    """
+    if index is None:
+        index = build_index(client)
+    records = state if state is not None else {}
+
+    def run(definition: Dict) -> SyncResult:
+        name = definition.get("name")
+        try:
+            return sync_workflow(client, definition, index.get(name), records.get(name), dry_run)
+        except Exception as e:
+            return SyncResult(name, "error", error=str(e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run, definitions))
+
+    if state is not None and not dry_run:
+        for result in results:
+            if result.workflow_id and not result.error:
+                state[result.name] = {
+                    "id": result.workflow_id,
+                    "hash": result.hash,
+                    "updatedAt": result.updated_at,
+                }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Sync workflow definitions to n8n."""
+    parser = argparse.ArgumentParser(description="Sync workflow definitions to n8n")
+    parser.add_argument("--dir", default=DEFAULT_WORKFLOWS_DIR, help="directory of workflow definitions")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="sync state file")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent API calls")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without applying them")
+    args = parser.parse_args(argv)
+
+    print("\n🔄 Syncing workflows to n8n")
+    print("=" * 50)
+
+    try:
+        client = N8nClient(pool_maxsize=args.workers)
+    except ValueError as e:
+        print(f"❌ Configuration Error: {e}")
+        return 1
+
+    definitions = discover_definitions(args.dir)
+    print(f"📂 Found {len(definitions)} workflow definition(s)")
+    for name in unstable_definitions(args.dir):
+        print(f"⚠️  {name} changes on every build (generated ids?); it will be updated on every sync")
+
+    state = load_state(args.state)
+    instance_state = state.setdefault(client.api_url, {})
+    results = sync_definitions(client, definitions, instance_state, args.dry_run, args.workers)
+    if not args.dry_run:
+        save_state(args.state, state)
+
+    icons = {"create": "🆕", "update": "✏️ ", "skip": "⏭️ ", "error": "❌"}
+    for result in results:
+        detail = result.error or result.workflow_id or ""
+        print(f"  {icons.get(result.action, '•')} {result.action:<6} {result.name} {detail}")
+
+    counts = {}
+    for result in results:
+        counts[result.action] = counts.get(result.action, 0) + 1
+    summary = ", ".join(f"{count} {action}" for action, count in sorted(counts.items()))
+    print(f"\n✨ Done{' (dry run)' if args.dry_run else ''}: {summary or 'nothing to sync'}")
+    return 1 if counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,21 +13,9 @@ from n8n_client import N8nClient
 from airtable_client import AirtableClient
 
 
-def create_crazy_daves_workflow():
-    """
-    Create Crazy Dave's workflow in n8n.
-    
-    This workflow demonstrates:
-    1. Manual trigger to start
-    2. Processing data with Crazy Dave's special logic
-    3. Output results
-    """
-    
-    # Initialize n8n client
-    n8n = N8nClient()
-    
-    # Define a simple workflow structure that matches n8n's format
-    workflow_data = {
+def build_workflow():
+    """Return the Crazy Dave's workflow definition."""
+    return {
         "name": "Crazy Dave's Workflow",
         "nodes": [
             {
@@ -97,6 +85,23 @@ def create_crazy_daves_workflow():
         },
         "settings": {}
     }
+
+
+def create_crazy_daves_workflow():
+    """
+    Create Crazy Dave's workflow in n8n.
+    
+    This workflow demonstrates:
+    1. Manual trigger to start
+    2. Processing data with Crazy Dave's special logic
+    3. Output results
+    """
+    
+    # Initialize n8n client
+    n8n = N8nClient()
+    
+    # Define a simple workflow structure that matches n8n's format
+    workflow_data = build_workflow()
     
     try:
         print("🎨 Creating Crazy Dave's Workflow...")
@@ -12,12 +12,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from n8n_client import N8nClient
 
 
-def create_test_workflow():
-    """Create a simple test workflow for poem and joke generation."""
-    
-    n8n = N8nClient()
-    
-    workflow_data = {
+def build_workflow():
+    """Return the poem & joke test workflow definition."""
+    return {
         "name": "TEST - Topic to Poem & Joke",
         "nodes": [
             # Node 1: Manual Trigger
@@ -165,6 +162,14 @@ def create_test_workflow():
         },
         "settings": {}
     }
+
+
+def create_test_workflow():
+    """Create a simple test workflow for poem and joke generation."""
+    
+    n8n = N8nClient()
+    
+    workflow_data = build_workflow()
     
     try:
         result = n8n.create_workflow(workflow_data)
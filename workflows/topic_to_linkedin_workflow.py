@@ -13,20 +13,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from n8n_client import N8nClient
 
 
-def create_topic_to_linkedin_workflow():
-    """
-    Create a workflow that:
-    1. Accepts a topic input
-    2. Generates a poem using OpenAI
-    3. Generates a joke using OpenAI
-    4. Posts both to LinkedIn
-    """
-    
-    # Initialize n8n client
-    n8n = N8nClient()
-    
-    # Define the workflow structure
-    workflow_data = {
+def build_workflow():
+    """Return the Topic to LinkedIn workflow definition."""
+    return {
         "name": "Topic to LinkedIn - Poem & Joke",
         "nodes": [
             # Node 1: Manual Trigger with topic input
@@ -266,6 +255,22 @@ def create_topic_to_linkedin_workflow():
         },
         "settings": {}
     }
+
+
+def create_topic_to_linkedin_workflow():
+    """
+    Create a workflow that:
+    1. Accepts a topic input
+    2. Generates a poem using OpenAI
+    3. Generates a joke using OpenAI
+    4. Posts both to LinkedIn
+    """
+    
+    # Initialize n8n client
+    n8n = N8nClient()
+    
+    # Define the workflow structure
+    workflow_data = build_workflow()
     
     try:
         print("🚀 Creating 'Topic to LinkedIn - Poem & Joke' Workflow...")
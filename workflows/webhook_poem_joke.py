@@ -12,12 +12,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from n8n_client import N8nClient
 
 
-def create_webhook_workflow():
-    """Create workflow with webhook trigger for web front end."""
-    
-    n8n = N8nClient()
-    
-    workflow_data = {
+def build_workflow():
+    """Return the webhook poem & joke workflow definition."""
+    return {
         "name": "Webhook - Poem & Joke Generator",
         "nodes": [
             # Node 1: Webhook Trigger
@@ -196,6 +193,14 @@ def create_webhook_workflow():
         },
         "settings": {}
     }
+
+
+def create_webhook_workflow():
+    """Create workflow with webhook trigger for web front end."""
+    
+    n8n = N8nClient()
+    
+    workflow_data = build_workflow()
     
     try:
         result = n8n.create_workflow(workflow_data)
@@ -0,0 +1,290 @@
+"""
+Webhook-based Poem or Joke Generator (single part)
+Creates a workflow that generates just the poem or just the joke, so the
+webhook proxy can request both in parallel and stream each as it finishes.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from n8n_client import N8nClient
+
+
+def build_workflow():
+    """Return the single-part poem / joke webhook workflow definition."""
+    return {
+        "name": "Webhook - Poem or Joke Part",
+        "nodes": [
+            # Node 1: Webhook Trigger
+            {
+                "parameters": {
+                    "httpMethod": "POST",
+                    "path": "poem-joke-part",
+                    "responseMode": "responseNode",
+                    "options": {}
+                },
+                "type": "n8n-nodes-base.webhook",
+                "typeVersion": 2,
+                "position": [240, 400],
+                "id": "poem-joke-part-webhook-001",
+                "name": "Webhook",
+                "webhookId": ""
+            },
+
+            # Node 2: Extract Topic and Part from Request
+            {
+                "parameters": {
+                    "assignments": {
+                        "assignments": [
+                            {
+                                "id": "poem-joke-part-topic-assign-001",
+                                "name": "topic",
+                                "value": "={{ $json.body.topic || $json.topic || 'AI and creativity' }}",
+                                "type": "string"
+                            },
+                            {
+                                "id": "poem-joke-part-part-assign-001",
+                                "name": "part",
+                                "value": "={{ $json.body.part || $json.part || 'poem' }}",
+                                "type": "string"
+                            }
+                        ]
+                    },
+                    "options": {}
+                },
+                "type": "n8n-nodes-base.set",
+                "typeVersion": 3.4,
+                "position": [460, 400],
+                "id": "poem-joke-part-topic-001",
+                "name": "Extract Topic"
+            },
+
+            # Node 3: Route to the requested generator
+            {
+                "parameters": {
+                    "conditions": {
+                        "options": {
+                            "caseSensitive": True,
+                            "leftValue": "",
+                            "typeValidation": "strict"
+                        },
+                        "conditions": [
+                            {
+                                "id": "poem-joke-part-condition-001",
+                                "leftValue": "={{ $json.part }}",
+                                "rightValue": "joke",
+                                "operator": {
+                                    "type": "string",
+                                    "operation": "equals"
+                                }
+                            }
+                        ],
+                        "combinator": "and"
+                    },
+                    "options": {}
+                },
+                "type": "n8n-nodes-base.if",
+                "typeVersion": 2,
+                "position": [680, 400],
+                "id": "poem-joke-part-route-001",
+                "name": "Is Joke?"
+            },
+
+            # Node 4: Generate Joke
+            {
+                "parameters": {
+                    "modelId": {
+                        "__rl": True,
+                        "value": "gpt-4o",
+                        "mode": "list"
+                    },
+                    "messages": {
+                        "values": [
+                            {
+                                "content": "=Write a clever, professional joke about: {{ $json.topic }}\n\nThe joke should be:\n- Workplace-appropriate\n- Smart and witty\n- Include relevant hashtags at the end\n\nReturn only the joke."
+                            }
+                        ]
+                    },
+                    "options": {}
+                },
+                "type": "@n8n/n8n-nodes-langchain.openAi",
+                "typeVersion": 1.8,
+                "position": [900, 300],
+                "id": "poem-joke-part-joke-001",
+                "name": "Generate Joke"
+            },
+
+            # Node 5: Generate Poem
+            {
+                "parameters": {
+                    "modelId": {
+                        "__rl": True,
+                        "value": "gpt-4o",
+                        "mode": "list"
+                    },
+                    "messages": {
+                        "values": [
+                            {
+                                "content": "=Write a creative and inspiring poem about: {{ $json.topic }}\n\nThe poem should be:\n- 4-8 lines long\n- Professional and thoughtful\n- Include relevant hashtags at the end\n\nReturn only the poem text."
+                            }
+                        ]
+                    },
+                    "options": {}
+                },
+                "type": "@n8n/n8n-nodes-langchain.openAi",
+                "typeVersion": 1.8,
+                "position": [900, 500],
+                "id": "poem-joke-part-poem-001",
+                "name": "Generate Poem"
+            },
+
+            # Node 6: Format the single part
+            {
+                "parameters": {
+                    "jsCode": "// Only one generator ran; format its output\nconst request = $('Extract Topic').first().json;\nconst text = $json.message?.content || $json.output || '';\n\nreturn [{\n  json: {\n    success: Boolean(text),\n    topic: request.topic,\n    part: request.part,\n    text: text || `Error generating ${request.part}`,\n    timestamp: new Date().toISOString()\n  }\n}];"
+                },
+                "type": "n8n-nodes-base.code",
+                "typeVersion": 2,
+                "position": [1120, 400],
+                "id": "poem-joke-part-format-001",
+                "name": "Format Part"
+            },
+
+            # Node 7: Respond to Webhook
+            {
+                "parameters": {
+                    "respondWith": "json",
+                    "responseBody": "={{ $json }}",
+                    "options": {}
+                },
+                "type": "n8n-nodes-base.respondToWebhook",
+                "typeVersion": 1.1,
+                "position": [1340, 400],
+                "id": "poem-joke-part-respond-001",
+                "name": "Respond"
+            }
+        ],
+        "connections": {
+            "Webhook": {
+                "main": [
+                    [
+                        {
+                            "node": "Extract Topic",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ]
+                ]
+            },
+            "Extract Topic": {
+                "main": [
+                    [
+                        {
+                            "node": "Is Joke?",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ]
+                ]
+            },
+            "Is Joke?": {
+                "main": [
+                    [
+                        {
+                            "node": "Generate Joke",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ],
+                    [
+                        {
+                            "node": "Generate Poem",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ]
+                ]
+            },
+            "Generate Joke": {
+                "main": [
+                    [
+                        {
+                            "node": "Format Part",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ]
+                ]
+            },
+            "Generate Poem": {
+                "main": [
+                    [
+                        {
+                            "node": "Format Part",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ]
+                ]
+            },
+            "Format Part": {
+                "main": [
+                    [
+                        {
+                            "node": "Respond",
+                            "type": "main",
+                            "index": 0
+                        }
+                    ]
+                ]
+            }
+        },
+        "settings": {}
+    }
+
+
+def create_part_workflow():
+    """Create the single-part workflow used by the streaming proxy."""
+
+    n8n = N8nClient()
+
+    workflow_data = build_workflow()
+
+    try:
+        result = n8n.create_workflow(workflow_data)
+
+        print("✅ Part Webhook Workflow Created!")
+        print("=" * 70)
+        print(f"📋 Name: {result['name']}")
+        print(f"🆔 ID: {result['id']}")
+        print(f"📦 Nodes: {len(result['nodes'])}")
+        print()
+        print("🎯 Workflow Structure:")
+        print("   1. 🪝 Webhook - Receives POST {topic, part}")
+        print("   2. 📝 Extract Topic - Gets topic and part from request")
+        print("   3. 🔀 Is Joke? - Routes to one generator")
+        print("   4. 😄 Generate Joke / 🤖 Generate Poem")
+        print("   5. 📊 Format Part - Formats the single result")
+        print("   6. 📤 Respond - Sends it back to the proxy")
+        print()
+        print("=" * 70)
+        print("🔗 Open: https://thestarrconspiracy.app.n8n.cloud/workflow/" + result['id'])
+        print()
+        print("📌 NEXT STEPS:")
+        print("   1. Open the workflow and ACTIVATE it")
+        print("   2. Add OpenAI credentials to both generator nodes")
+        print("   3. Run webhook_proxy.py and enable streaming in the front end")
+
+        return result
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+if __name__ == "__main__":
+    create_part_workflow()